@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+#
+# Measure read throughput of file-based backend in several processes while
+# other processes continuously save settings to the same file.
+#
+# Each read also checked for consistency, so broken reads (partially written
+# file or empty data) are counted as errors. In suite results throughput is
+# stored as average time per read and per save, while any broken read fails
+# the benchmark.
+#
+import multiprocessing
+import time
+
+from common import configure_settings, destroy_settings, run
+
+
+COUNTER = 100
+DURATION = 2.0
+FORMATS = ('ini', 'json', 'pickle')
+READERS = 4
+WRITERS = 2
+
+
+def other_backend(settings):
+    backend = settings._backend
+    return backend.__class__(available_settings=backend.available_settings,
+                             filename=backend.filename,
+                             format=backend.format,
+                             framework=backend.framework)
+
+
+def bench_format(format, readers=READERS, writers=WRITERS,
+                 duration=DURATION):
+    settings = configure_settings(COUNTER, format)
+
+    try:
+        data = dict(('SETTING_%d' % i, i) for i in xrange(COUNTER))
+        settings._backend.data = data
+        settings.save()
+
+        stop = multiprocessing.Event()
+        errors = multiprocessing.Value('i', 0)
+        reads = multiprocessing.Value('i', 0)
+        saves = multiprocessing.Value('i', 0)
+
+        def read():
+            backend, counter, failed = other_backend(settings), 0, 0
+
+            while not stop.is_set():
+                try:
+                    value = backend.read()
+                except Exception:
+                    value = {}
+
+                if len(value) != COUNTER:
+                    failed += 1
+
+                counter += 1
+
+            with reads.get_lock():
+                reads.value += counter
+
+            with errors.get_lock():
+                errors.value += failed
+
+        def write():
+            backend, counter = other_backend(settings), 0
+
+            while not stop.is_set():
+                backend.data = dict(data, SETTING_0=counter)
+                backend.save()
+                counter += 1
+
+            with saves.get_lock():
+                saves.value += counter
+
+        processes = [multiprocessing.Process(target=read)
+                     for _ in xrange(readers)] + \
+                    [multiprocessing.Process(target=write)
+                     for _ in xrange(writers)]
+
+        for process in processes:
+            process.start()
+
+        time.sleep(duration)
+        stop.set()
+
+        for process in processes:
+            process.join()
+
+        return (reads.value / duration, saves.value / duration, errors.value)
+    finally:
+        destroy_settings(settings)
+
+
+def collect():
+    results = {}
+
+    for format in FORMATS:
+        reads, saves, errors = bench_format(format)
+
+        if errors:
+            raise AssertionError('%d broken reads of %r settings file' % \
+                                 (errors, format))
+
+        results['concurrency.%s.read' % format] = 1.0 / reads
+        results['concurrency.%s.save' % format] = 1.0 / saves
+
+    return results
+
+
+def main():
+    print('Read file-based settings in %d processes, while %d processes '
+          'save them' % (READERS, WRITERS))
+
+    for format in FORMATS:
+        reads, saves, errors = bench_format(format)
+        print('%6s: %9.1f reads/sec, %7.1f saves/sec, %d broken reads' % \
+              (format, reads, saves, errors))
+
+
+if __name__ == '__main__':
+    run(collect, main)
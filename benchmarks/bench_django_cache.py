@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+#
+# Measure how long does it take to get ``Settings`` instance from the Django
+# cache (cache hit) and from the database (cache miss), when it stores 10,
+# 100, 1000 or 10000 settings.
+#
+# Needs Django installed, so run it with Python from Django test project
+# virtual environment.
+#
+from django.conf import settings as django_settings
+
+
+django_settings.configure(
+    CACHE_BACKEND='locmem://',
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3',
+                           'NAME': ':memory:'}},
+    INSTALLED_APPS=('setman.frameworks.django_setman', ),
+)
+
+
+from django.core.cache import cache
+from django.core.management import call_command
+
+from common import measure, run
+
+
+COUNTERS = (10, 100, 1000, 10000)
+
+
+def bench_get(counter):
+    from setman.backends.django.managers import CACHE_KEY
+    from setman.frameworks.django_setman.models import Settings
+
+    Settings.objects.all().delete()
+    cache.clear()
+
+    Settings.objects.create(
+        data=dict(('SETTING_%d' % i, i) for i in xrange(counter))
+    )
+
+    def get_miss():
+        cache.delete(CACHE_KEY)
+        Settings.objects.get()
+
+    miss = measure(get_miss, number=100)
+
+    # Put instance to the cache first
+    Settings.objects.get()
+
+    return measure(Settings.objects.get, number=1000), miss
+
+
+def collect():
+    call_command('syncdb', interactive=False, verbosity=0)
+    results = {}
+
+    for counter in COUNTERS:
+        hit, miss = bench_get(counter)
+        results['django.cache_hit.%d' % counter] = hit
+        results['django.cache_miss.%d' % counter] = miss
+
+    return results
+
+
+def main():
+    call_command('syncdb', interactive=False, verbosity=0)
+
+    print('Get Settings instance from the Django cache and from the database')
+
+    for counter in COUNTERS:
+        hit, miss = bench_get(counter)
+        print('%6d settings: %8.2f usec per cache hit, %8.2f usec per cache '
+              'miss' % (counter, hit * 1000000, miss * 1000000))
+
+
+if __name__ == '__main__':
+    run(collect, main)
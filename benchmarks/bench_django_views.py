@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+#
+# Measure how long does it take to render edit settings page of Django test
+# project.
+#
+# Needs Django test project bootstrapped, so run it with Python from its
+# virtual environment.
+#
+import os
+import sys
+
+
+DIRNAME = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(DIRNAME, '..', 'testproject-django'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'settings')
+
+
+from django.conf import settings as django_settings
+from django.contrib.auth.models import User
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.client import Client
+
+from common import measure, run
+
+
+def bench_edit():
+    django_settings.AUTHENTICATION_BACKENDS = (
+        'django.contrib.auth.backends.ModelBackend',
+    )
+
+    old_name = django_settings.DATABASES['default']['NAME']
+    connection.creation.create_test_db(verbosity=0)
+
+    try:
+        User.objects.create_superuser(username='bench',
+                                      email='bench@domain.com',
+                                      password='bench')
+
+        client = Client()
+        client.login(username='bench', password='bench')
+
+        url = reverse('setman_edit')
+        response = client.get(url)
+        assert response.status_code == 200, response.status_code
+
+        return measure(lambda: client.get(url), number=100)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def collect():
+    return {'django.edit_page': bench_edit()}
+
+
+def main():
+    print('Render edit settings page of Django test project')
+    print('%8.2f msec per request' % (bench_edit() * 1000))
+
+
+if __name__ == '__main__':
+    run(collect, main)
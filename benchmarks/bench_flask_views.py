@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+#
+# Measure how long does it take to render edit settings page of Flask test
+# project.
+#
+# Needs Flask test project bootstrapped, so run it with Python from its
+# virtual environment.
+#
+import os
+import sys
+
+
+DIRNAME = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(DIRNAME, '..', 'testproject-flask'))
+
+
+from flask import url_for
+from setman import settings
+
+from common import measure, run
+from testapp import app
+
+
+def bench_edit():
+    backend = settings._backend
+    old_filename = backend.filename
+    backend.filename += '.bench'
+
+    try:
+        client = app.test_client()
+
+        with app.test_request_context():
+            url = url_for('setman.edit')
+
+        response = client.get(url)
+        assert response.status_code == 200, response.status_code
+
+        return measure(lambda: client.get(url), number=100)
+    finally:
+        filename, backend.filename = backend.filename, old_filename
+        backend.clear()
+
+        for suffix in ('', '.generation', '.lock'):
+            if os.path.isfile(filename + suffix):
+                os.unlink(filename + suffix)
+
+
+def collect():
+    return {'flask.edit_page': bench_edit()}
+
+
+def main():
+    print('Render edit settings page of Flask test project')
+    print('%8.2f msec per request' % (bench_edit() * 1000))
+
+
+if __name__ == '__main__':
+    run(collect, main)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+#
+# Measure how long does it take to read one setting from ``LazySettings``
+# instance, when backend stores 10, 100, 1000 or 10000 settings.
+#
+# Time of one read should not depend on number of stored settings.
+#
+from common import configure_settings, destroy_settings, measure, run
+
+
+COUNTERS = (10, 100, 1000, 10000)
+
+
+def bench_read(counter):
+    settings = configure_settings(counter)
+
+    try:
+        settings._backend.data = \
+            dict(('SETTING_%d' % i, i + 1) for i in xrange(counter))
+        settings.save()
+
+        name = 'SETTING_%d' % (counter / 2)
+        return measure(lambda: getattr(settings, name))
+    finally:
+        destroy_settings(settings)
+
+
+def collect():
+    return dict(('lazy.read.%d' % counter, bench_read(counter))
+                for counter in COUNTERS)
+
+
+def main():
+    print('Read one setting from LazySettings instance')
+
+    for counter in COUNTERS:
+        print('%6d settings: %8.2f usec per read' % \
+              (counter, bench_read(counter) * 1000000))
+
+
+if __name__ == '__main__':
+    run(collect, main)
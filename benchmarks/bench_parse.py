@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+#
+# Measure how long does it take to parse configuration definition file with
+# 10, 100, 1000 or 10000 settings.
+#
+import os
+import shutil
+import tempfile
+
+from common import measure, run, write_settings_file
+
+from setman.frameworks import SetmanFramework
+from setman.utils.parsing import parse_configs
+
+
+COUNTERS = (10, 100, 1000, 10000)
+
+
+def bench_parse(counter):
+    dirname = tempfile.mkdtemp(prefix='setman-bench-')
+    settings_file = os.path.join(dirname, 'settings.cfg')
+
+    try:
+        write_settings_file(settings_file, counter)
+        framework = SetmanFramework(settings_file=settings_file)
+
+        return measure(lambda: parse_configs(framework), number=1, repeat=3)
+    finally:
+        shutil.rmtree(dirname)
+
+
+def collect():
+    return dict(('parse.%d' % counter, bench_parse(counter))
+                for counter in COUNTERS)
+
+
+def main():
+    print('Parse configuration definition file')
+
+    for counter in COUNTERS:
+        print('%6d settings: %8.2f msec per parse' % \
+              (counter, bench_parse(counter) * 1000))
+
+
+if __name__ == '__main__':
+    run(collect, main)
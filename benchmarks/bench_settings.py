@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+#
+# Measure main operations of ``LazySettings`` instance configured with
+# file-based backend in each supported format, when there are 10, 100, 1000
+# or 10000 available settings: reading and writing one setting, validating
+# changed and all settings, saving and reverting settings.
+#
+from common import configure_settings, destroy_settings, measure, run
+
+
+COUNTERS = (10, 100, 1000, 10000)
+FORMATS = ('ini', 'json', 'pickle', 'binary')
+OPERATIONS = ('read', 'write', 'is_valid', 'is_valid_full', 'save', 'revert')
+
+
+def bench_settings(counter, format):
+    settings = configure_settings(counter, format)
+
+    try:
+        settings._backend.data = \
+            dict(('SETTING_%d' % i, i + 1) for i in xrange(counter))
+        settings.save()
+
+        name = 'SETTING_%d' % (counter / 2)
+        number = max(1, 1000 / counter)
+
+        def write():
+            setattr(settings, name, counter)
+
+        def save():
+            setattr(settings, name, counter)
+            settings.save()
+
+        return {
+            'read': measure(lambda: getattr(settings, name)),
+            'write': measure(write, number=1000),
+            'is_valid': measure(settings.is_valid, number=1000),
+            'is_valid_full': measure(lambda: settings.is_valid(full=True),
+                                     number=number),
+            'save': measure(save, number=number),
+            'revert': measure(settings.revert, number=number),
+        }
+    finally:
+        destroy_settings(settings)
+
+
+def collect():
+    results = {}
+
+    for format in FORMATS:
+        for counter in COUNTERS:
+            timings = bench_settings(counter, format)
+
+            for operation, value in timings.iteritems():
+                results['settings.%s.%s.%d' % (format, operation, counter)] =\
+                    value
+
+    return results
+
+
+def main():
+    print('LazySettings operations with file-based backend, usec per call')
+    print('%6s %6s %s' % ('format', 'count',
+                          ' '.join('%13s' % op for op in OPERATIONS)))
+
+    for format in FORMATS:
+        for counter in COUNTERS:
+            timings = bench_settings(counter, format)
+            print('%6s %6d %s' % (format, counter,
+                                  ' '.join('%13.2f' % (timings[op] * 1000000)
+                                           for op in OPERATIONS)))
+
+
+if __name__ == '__main__':
+    run(collect, main)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+#
+# Measure read throughput of settings shared by 1, 2 or 4 threads, while one
+# more thread continuously changes and saves settings.
+#
+# Number of settings file reads is also reported: after each save data is
+# reloaded only once, by one of reader threads, while others wait for it.
+#
+# Readers never block, so with more threads writer hardly gets GIL back after
+# its file operations and saves almost stop (about 60 saves/sec with 1 reader
+# thread, but only a few with 16 or 32 ones). Reads are then served from cache
+# only and result doesn't show cost of reloads anymore, so more threads are
+# not measured by default. Pass other numbers of threads as arguments to
+# measure them anyway, e.g. ``python benchmarks/bench_threads.py 8 16 32``.
+#
+import sys
+import threading
+import time
+
+from common import configure_settings, destroy_settings, run
+
+
+COUNTER = 100
+DURATION = 2.0
+SAVE_INTERVAL = 0.01
+THREADS = (1, 2, 4)
+
+
+def bench_threads(threads, duration=DURATION):
+    settings = configure_settings(COUNTER)
+    backend = settings._backend
+
+    try:
+        settings.save()
+
+        counters, reads, saves = [0] * threads, [0], [0]
+        stop = threading.Event()
+        original_read = backend.read
+
+        def counted_read():
+            reads[0] += 1
+            return original_read()
+
+        backend.read = counted_read
+
+        def read(index):
+            counter = 0
+
+            while not stop.is_set():
+                for i in xrange(10):
+                    getattr(settings, 'SETTING_%d' % i)
+                counter += 10
+
+            counters[index] = counter
+
+        def write():
+            counter = 0
+
+            while not stop.is_set():
+                settings.SETTING_0 = counter % COUNTER
+                settings.save()
+                counter += 1
+                time.sleep(SAVE_INTERVAL)
+
+            saves[0] = counter
+
+        workers = [threading.Thread(target=read, args=(i, ))
+                   for i in xrange(threads)]
+        workers.append(threading.Thread(target=write))
+
+        for worker in workers:
+            worker.start()
+
+        time.sleep(duration)
+        stop.set()
+
+        for worker in workers:
+            worker.join()
+
+        return (sum(counters) / duration, saves[0] / duration,
+                reads[0] / duration)
+    finally:
+        destroy_settings(settings)
+
+
+def collect():
+    # Store average time of one read, so as for other benchmarks less is
+    # better
+    return dict(('threads.read.%d' % threads, 1.0 / bench_threads(threads)[0])
+                for threads in get_threads())
+
+
+def get_threads():
+    threads = [int(arg) for arg in sys.argv[1:] if arg.isdigit()]
+    return threads or THREADS
+
+
+def main():
+    print('Read settings in many threads, while one thread saves them every '
+          '%d msec' % (SAVE_INTERVAL * 1000))
+
+    for threads in get_threads():
+        reads, saves, reloads = bench_threads(threads)
+        print('%2d threads: %10.1f reads/sec, %5.1f saves/sec, '
+              '%5.1f file reads/sec' % (threads, reads, saves, reloads))
+
+
+if __name__ == '__main__':
+    run(collect, main)
@@ -0,0 +1,95 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from setman.lazy import LazySettings
+
+
+__all__ = ('configure_settings', 'destroy_settings', 'measure', 'run',
+           'write_settings_file')
+
+
+DEFAULT_NUMBER = 10000
+DEFAULT_REPEAT = 3
+
+
+def configure_settings(counter, format='json', backend=None, **kwargs):
+    """
+    Create temporary directory with configuration definition file for
+    ``counter`` int settings and return new ``LazySettings`` instance
+    configured with file-based backend.
+    """
+    dirname = tempfile.mkdtemp(prefix='setman-bench-')
+    settings_file = os.path.join(dirname, 'settings.cfg')
+    write_settings_file(settings_file, counter)
+
+    settings = LazySettings()
+    settings.configure(backend=backend or 'setman.backends.filebased',
+                       filename=os.path.join(dirname, 'settings.%s' % format),
+                       format=format,
+                       settings_file=settings_file,
+                       **kwargs)
+
+    return settings
+
+
+def destroy_settings(settings):
+    """
+    Remove temporary directory created by ``configure_settings``.
+    """
+    dirname = os.path.dirname(settings._backend.filename)
+
+    if os.path.isdir(dirname):
+        shutil.rmtree(dirname)
+
+
+def measure(func, number=DEFAULT_NUMBER, repeat=DEFAULT_REPEAT):
+    """
+    Call ``func`` ``number`` times for ``repeat`` rounds and return best
+    average time of one call in seconds.
+    """
+    best = None
+
+    for _ in xrange(repeat):
+        started = time.time()
+
+        for _ in xrange(number):
+            func()
+
+        elapsed = (time.time() - started) / number
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
+
+
+def run(collect, report):
+    """
+    Run benchmark script: print results of ``collect`` function (``dict`` of
+    result names and best average times in seconds) as JSON, if script
+    executed with ``--json`` option, or call ``report`` function to print
+    human readable results otherwise.
+
+    JSON output is used by ``benchmarks/run.py`` suite runner.
+    """
+    if '--json' in sys.argv[1:]:
+        sys.stdout.write(json.dumps(collect()) + '\n')
+    else:
+        report()
+
+
+def write_settings_file(path, counter, prefix='SETTING_'):
+    """
+    Write configuration definition file with ``counter`` int settings.
+    """
+    handler = open(path, 'w+')
+
+    for i in xrange(counter):
+        handler.write('[%s%d]\ntype = int\ndefault = %d\nmin_value = 0\n\n' %
+                      (prefix, i, i))
+
+    handler.close()
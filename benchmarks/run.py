@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+#
+# Run benchmark scripts, store their results to JSON file and compare them
+# with results of previous run (baseline).
+#
+# Each benchmark script is executed in its own process with ``--json`` option
+# and prints ``dict`` of result names and best average times in seconds, so
+# less is better for all results. If any result is slower than baseline one
+# by more than threshold (0.25 means 25%), runner exits with non-zero status.
+#
+# Usage::
+#
+#     $ python benchmarks/run.py -o results.json -b baseline.json bench_parse
+#
+import json
+import os
+import subprocess
+import sys
+import time
+
+from optparse import OptionParser
+
+
+DIRNAME = os.path.abspath(os.path.dirname(__file__))
+ROOT = os.path.dirname(DIRNAME)
+DEFAULT_THRESHOLD = 0.25
+
+
+def compare(results, baseline, threshold):
+    """
+    Print comparison of results with baseline and return list of names of
+    results, which are slower than baseline ones by more than threshold.
+    """
+    regressions = []
+
+    print('%-40s %12s %12s %8s' % ('name', 'baseline', 'current', 'change'))
+
+    for name in sorted(results):
+        value = results[name]
+
+        if not name in baseline:
+            print('%-40s %12s %12s %8s' % (name, '-', format_time(value), '-'))
+            continue
+
+        old_value = baseline[name]
+        change = (value - old_value) / old_value if old_value else 0.0
+        mark = ''
+
+        if change > threshold:
+            mark = ' !'
+            regressions.append(name)
+
+        print('%-40s %12s %12s %+7.1f%%%s' % \
+              (name, format_time(old_value), format_time(value),
+               change * 100, mark))
+
+    return regressions
+
+
+def format_time(value):
+    """
+    Format time in seconds with most suitable units.
+    """
+    if value < 0.001:
+        return '%.2f usec' % (value * 1000000)
+    if value < 1:
+        return '%.2f msec' % (value * 1000)
+    return '%.2f sec' % value
+
+
+def load_results(filename):
+    """
+    Read results from JSON file, stored by previous run.
+    """
+    handler = open(filename, 'rb')
+
+    try:
+        return json.load(handler)['results']
+    finally:
+        handler.close()
+
+
+def run_benchmark(name, python):
+    """
+    Execute benchmark script in separate process and return its results.
+    """
+    path = os.path.join(DIRNAME, name + '.py')
+
+    # Benchmarks should import ``setman`` from this working copy
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, (ROOT, env.get('PYTHONPATH')))
+    )
+
+    process = subprocess.Popen([python, path, '--json'],
+                               env=env,
+                               stdout=subprocess.PIPE)
+    output = process.communicate()[0]
+
+    if process.returncode:
+        raise RuntimeError('Benchmark %r failed with %d exit status' % \
+                           (name, process.returncode))
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def save_results(filename, results, benchmarks, python):
+    """
+    Store results to JSON file.
+    """
+    dirname = os.path.dirname(os.path.abspath(filename))
+
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname)
+
+    data = {'benchmarks': benchmarks,
+            'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': python,
+            'results': results}
+
+    handler = open(filename, 'w+')
+
+    try:
+        json.dump(data, handler, indent=2, sort_keys=True)
+    finally:
+        handler.close()
+
+
+def main():
+    parser = OptionParser(usage='%prog [options] benchmark [benchmark ...]')
+    parser.add_option('-b', '--baseline', dest='baseline', default=None,
+                      help='Compare results with baseline JSON file.')
+    parser.add_option('-o', '--output', dest='output', default=None,
+                      help='Store results to JSON file.')
+    parser.add_option('-p', '--python', dest='python',
+                      default=sys.executable,
+                      help='Python executable to run benchmarks with.')
+    parser.add_option('-t', '--threshold', dest='threshold', type='float',
+                      default=DEFAULT_THRESHOLD,
+                      help='Allowed slowdown comparing to baseline, by '
+                           'default: %default.')
+
+    options, benchmarks = parser.parse_args()
+
+    if not benchmarks:
+        parser.error('Please, supply at least one benchmark name.')
+
+    results = {}
+
+    for name in benchmarks:
+        print('Running %s...' % name)
+        sys.stdout.flush()
+
+        try:
+            results.update(run_benchmark(name, options.python))
+        except (OSError, RuntimeError, ValueError), e:
+            print('ERROR: %s' % e)
+            return 2
+
+    if options.output:
+        save_results(options.output, results, benchmarks, options.python)
+
+    if not options.baseline:
+        return 0
+
+    if not os.path.isfile(options.baseline):
+        print('Baseline file %r does not exist, nothing to compare with.' % \
+              options.baseline)
+        return 0
+
+    regressions = compare(results, load_results(options.baseline),
+                          options.threshold)
+
+    if regressions:
+        print('%d results are slower than baseline by more than %.0f%%' % \
+              (len(regressions), options.threshold * 100))
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,18 +1,60 @@
+import threading
+
+from contextlib import contextmanager
+from functools import wraps
+from UserDict import DictMixin
+
 from setman.exceptions import ValidationError
+from setman.notifiers import get_notifier_klass
+from setman.utils import stats
+from setman.utils.binary import LazyDict
+from setman.utils.executors import get_executor
 from setman.utils.parsing import is_settings_container
 
 
-__all__ = ('SetmanBackend', )
+__all__ = ('SetmanBackend', 'synchronized')
+
+
+def synchronized(method):
+    """
+    Run backend method while holding backend ``write_lock``.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.write_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class SetmanBackend(object):
     """
     How ``setman`` library will interact with the data storage.
+
+    If ``notifier`` (Python path to notifier module, like
+    ``'setman.notifiers.sockets'``) is set, backend broadcasts generation of
+    data to other processes on each save, and reloads data only when
+    notification from other process received, so reading settings doesn't
+    check the data storage at all. Options of notifier could be passed as
+    ``notifier_options`` dict.
+
+    Backend is safe to use from many threads. Readers never take locks: they
+    get current data snapshot, which is never changed in place. Writes
+    (setting values, batches, saving and reverting) are serialized by
+    reentrant ``write_lock``, and when data snapshot should be reloaded only
+    one thread reads it from the data storage, while others wait for its
+    result.
     """
     available_settings = None
+    batch_depth = 0
+    partial_save = False
     data_cache_key = '_data_cache'
+    data_generation = None
+    data_reloads = 0
+    data_version = 0
+    executor = None
     framework = None
-    ignore_cache = False
+    notifier = None
+    notifier_options = None
 
     def __init__(self, **kwargs):
         """
@@ -24,6 +66,9 @@ class SetmanBackend(object):
             kwargs.pop('data')
 
         self.__dict__.update(kwargs)
+        self.dirty_keys = set()
+        self.lookup_cache = {}
+        self.write_lock = threading.RLock()
 
     def __getattribute__(self, name):
         """
@@ -37,50 +82,165 @@ class SetmanBackend(object):
 
         return super(SetmanBackend, self).__getattribute__(name)
 
+    def ais_valid(self, full=False):
+        """
+        Run ``is_valid`` in background thread and return future with its
+        result.
+        """
+        return self.submit(self.is_valid, full=full)
+
+    def aread(self):
+        """
+        Run ``read`` in background thread and return future with its result.
+        """
+        return self.submit(self.read)
+
+    def arevert(self):
+        """
+        Run ``revert`` in background thread and return future.
+        """
+        return self.submit(self.revert)
+
+    def asave(self, keys=None):
+        """
+        Run ``save`` in background thread and return future.
+        """
+        if keys is None or not self.partial_save:
+            return self.submit(self.save)
+        return self.submit(self.save, keys=keys)
+
+    @contextmanager
+    def batch(self, save=False):
+        """
+        Collect all values set by ``set_value`` inside ``with`` block and
+        publish them as new data snapshot only once, on exit from block.
+
+        Readers continue to see previous data snapshot until block is
+        finished. If ``save`` is ``True``, settings would also be saved right
+        after publishing. On exception, all collected values are discarded.
+
+        Batches could be nested, in that case values are published on exit
+        from outer block, and on exception in nested block only values
+        collected by it are discarded. Block holds ``write_lock``, so writes
+        from other threads wait until it finished.
+        """
+        with self.write_lock:
+            with self._batch(save):
+                yield self
+
+    @synchronized
     def clear(self):
         """
         Clear data cache from backend instance if any.
         """
         del self.data
+        self.clear_lookup_cache()
+        self.dirty_keys = set()
 
         if hasattr(self, 'error'):
             delattr(self, 'error')
 
+    def clear_lookup_cache(self):
+        """
+        Drop all values resolved by ``LazySettings`` instances at once.
+        """
+        self.lookup_cache = {}
+
     @property
     def data(self):
         """
         Simple way to read backend data.
-        """
-        ignore_cache = self.ignore_cache
-
-        if not hasattr(self, self.data_cache_key) or ignore_cache:
-            value = self._batch_method('to_python', self.read())
-            setattr(self, self.data_cache_key, value)
 
-        return getattr(self, self.data_cache_key)
+        Returned ``dict`` is a snapshot shared by all readers, so it should
+        never be changed in place. To change settings data, build new ``dict``
+        and assign it to ``data`` attribute instead.
+        """
+        return self._get_data()
 
     @data.deleter
+    @synchronized
     def data(self):
         """
         Invalidate backend data.
         """
         if hasattr(self, self.data_cache_key):
             delattr(self, self.data_cache_key)
+            self.data_version += 1
+            self.clear_lookup_cache()
 
     @data.setter
+    @synchronized
     def data(self, value):
         """
-        Assign new data to the backend.
+        Assign new data to the backend. Inside ``batch`` block data replaces
+        values collected by the batch and is published on exit from block.
         """
         value = self._batch_method('to_python', value)
-        setattr(self, self.data_cache_key, value)
 
-    def is_valid(self, prefix=None):
+        if self.batch_depth and self._batch_data is not None:
+            old_data = self._batch_data
+        else:
+            old_data = getattr(self, self.data_cache_key, None)
+
+        changed, deleted = self._changes(old_data or {}, value)
+        keys = set(changed)
+        keys.update(deleted)
+
+        if self.batch_depth:
+            if self._batch_data is None:
+                self._batch_keys = set()
+
+            self._batch_data = value
+            self._batch_copied = set()
+            self._batch_keys.update(keys)
+        else:
+            self.dirty_keys.update(keys)
+            self._set_data_cache(value)
+
+    @property
+    def generation(self):
+        """
+        Return generation token of data in the data storage or ``None`` if
+        backend doesn't support generations.
+
+        Generation should be cheap to read and should change on each save,
+        even if settings were saved by another process. If it differs from
+        ``data_generation`` (generation of current data snapshot), data would
+        be reloaded on next access.
+        """
+        return None
+
+    @property
+    def ignore_cache(self):
         """
-        Validate every setting before save.
+        Return ``True`` if current data snapshot is outdated and should be
+        reloaded from the data storage.
+        """
+        if self.notifier:
+            return self._notifier_changed()
+
+        generation = self.generation
+
+        if generation is None:
+            return False
+
+        return generation != self.data_generation
+
+    @synchronized
+    def is_valid(self, full=False):
+        """
+        Validate settings before save.
+
+        Only settings changed since last data loading or saving (stored in
+        ``dirty_keys`` as ``(app_name, name)`` tuples, app name for project
+        settings is empty string) are validated. Pass ``full=True`` to
+        validate all settings.
         """
         try:
-            self._batch_method('validate', self.data)
+            if full:
+                self._batch_method('validate', self.data)
+            else:
+                self._validate_keys(self.dirty_keys)
         except self.framework.ValidationError, e:
             setattr(self, 'error', e)
             return False
@@ -90,6 +250,14 @@ class SetmanBackend(object):
 
         return True
 
+    def notify(self, generation=None):
+        """
+        Let other processes know that data with ``generation`` saved, if
+        ``notifier`` is set.
+        """
+        if self.notifier:
+            self._get_notifier().notify(generation)
+
     def read(self):
         """
         Read settings from data storage.
@@ -119,33 +287,436 @@ class SetmanBackend(object):
         if prefix:
             return data
 
-        self.data = data
-        self.save()
+        # Replace all data, so stored values of settings, which aren't
+        # available anymore, are dropped too
+        with self.batch(save=True):
+            self.data = data
 
-    def save(self):
+    def save(self, keys=None):
         """
         Save current settings data to the data storage.
+
+        If backend supports partial saving (``partial_save`` is ``True``) and
+        ``keys`` passed, only values of these settings (iterable of
+        ``(app_name, name)`` tuples, app name for project settings is empty
+        string) would be written, other stored values stay untouched.
         """
         raise NotImplementedError
 
+    def save_changes(self):
+        """
+        Save only settings changed since last data loading or saving. If
+        backend doesn't support partial saving, whole data would be saved.
+        """
+        if not self.partial_save:
+            return self.save()
+        return self.save(keys=set(self.dirty_keys))
+
+    @synchronized
+    def set_value(self, name, value, prefix=None):
+        """
+        Convert value to Python type and set it to the ``name`` setting (or
+        ``prefix`` app setting).
+
+        Only that one value would be converted. Outside of ``batch`` block
+        new data snapshot is published immediately, otherwise value is
+        collected to the batch data.
+        """
+        value = self._to_python_value(name, value, prefix)
+
+        if self.batch_depth:
+            if self._batch_data is None:
+                self._batch_data = dict(self.data)
+                self._batch_copied = set()
+                self._batch_keys = set()
+            data = self._batch_data
+        else:
+            data = dict(self.data)
+
+        if not prefix:
+            data[name] = value
+        else:
+            # Copy app data only once per batch to not change previous data
+            # snapshot in place
+            if not self.batch_depth or not prefix in self._batch_copied:
+                data[prefix] = dict(data.get(prefix) or {})
+
+                if self.batch_depth:
+                    self._batch_copied.add(prefix)
+
+            data[prefix][name] = value
+
+        # Keys set in batch become dirty only when batch is published, so
+        # discarded batch doesn't leave them dirty
+        if self.batch_depth:
+            self._batch_keys.add((prefix or '', name))
+        else:
+            self.dirty_keys.add((prefix or '', name))
+            self._set_data_cache(data)
+
+    def snapshot(self):
+        """
+        Return tuple of current data snapshot and lookup cache of values
+        resolved from it.
+
+        Lookup cache is replaced only after publishing new data snapshot, so
+        if it is the same before and after reading data, values resolved from
+        that data could be safely stored to it.
+        """
+        while True:
+            lookup_cache = self.lookup_cache
+            data = self.data
+
+            if self.lookup_cache is lookup_cache:
+                return data, lookup_cache
+
+    def stop_notifier(self):
+        """
+        Stop listening for notifications if notifier started.
+        """
+        notifier = getattr(self, '_notifier', None)
+
+        if notifier is not None:
+            notifier.stop()
+            delattr(self, '_notifier')
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Call function in background thread of backend ``executor`` (or shared
+        executor) and return future with its result.
+
+        Future is ``concurrent.futures.Future`` instance if ``futures``
+        library is available, so it could be wrapped with
+        ``asyncio.wrap_future`` in async code.
+        """
+        executor = self.executor or get_executor()
+        return executor.submit(func, *args, **kwargs)
+
+    @contextmanager
+    def _batch(self, save):
+        """
+        Collect values for ``batch`` block. Should be called only while
+        holding ``write_lock``.
+        """
+        if not self.batch_depth:
+            self._batch_data = None
+            self._batch_save = False
+            state = None
+        else:
+            # Nested block collects values to its own copy of batch data, so
+            # on exception state of outer block could be restored
+            state = (self._batch_data, getattr(self, '_batch_copied', None),
+                     getattr(self, '_batch_keys', None), self._batch_save)
+
+            if self._batch_data is not None:
+                self._batch_data = dict(self._batch_data)
+                self._batch_copied = set()
+                self._batch_keys = set(self._batch_keys)
+
+        self._batch_save = self._batch_save or save
+        self.batch_depth += 1
+
+        try:
+            yield self
+        except:
+            self.batch_depth -= 1
+
+            if self.batch_depth:
+                self._batch_data, self._batch_copied, self._batch_keys, \
+                    self._batch_save = state
+            else:
+                self._batch_data = None
+
+            raise
+
+        self.batch_depth -= 1
+
+        if self.batch_depth:
+            return
+
+        data, self._batch_data = self._batch_data, None
+
+        if data is not None:
+            self.dirty_keys.update(self._batch_keys)
+            self._set_data_cache(data)
+
+        if self._batch_save:
+            self.save()
+
     def _batch_method(self, method, data, prefix=None):
         """
         Run batch ``method`` for data.
+
+        Method doesn't change ``data`` in place, but returns new ``dict`` with
+        processed values.
         """
         available_settings = self.available_settings
+        result = {}
 
         if prefix:
             available_settings = getattr(available_settings, prefix)
 
         for key, value in data.items():
             if not hasattr(available_settings, key):
+                result[key] = value
                 continue
 
             mixed = getattr(available_settings, key)
 
             if is_settings_container(mixed):
-                data[key] = self._batch_method(method, value, key)
+                result[key] = self._batch_method(method, value, key)
             else:
-                data[key] = getattr(mixed, method)(value)
+                result[key] = getattr(mixed, method)(value)
+
+        return result
+
+    def _to_python_value(self, name, value, prefix=None):
+        """
+        Convert only one value of ``name`` setting (or ``prefix`` app setting)
+        to Python type.
+        """
+        available_settings = self.available_settings
+
+        if prefix:
+            available_settings = getattr(available_settings, prefix, None)
+
+        mixed = getattr(available_settings, name, None)
+
+        if mixed is not None and not is_settings_container(mixed):
+            value = mixed.to_python(value)
+
+        return value
+
+    def _changes(self, old_data, new_data, keys=None):
+        """
+        Compare two data dicts and return tuple of changed values dict and
+        list of deleted keys, where each key is ``(app_name, name)`` tuple.
+        App name for project settings is empty string.
+
+        If ``keys`` passed, only values of these keys are compared.
+        """
+        if keys is not None:
+            changed, deleted = {}, []
+
+            for key in keys:
+                old_found, old_value = self._lookup_key(old_data, key)
+                new_found, new_value = self._lookup_key(new_data, key)
+
+                if new_found and (not old_found or old_value != new_value):
+                    changed[key] = new_value
+                elif old_found and not new_found:
+                    deleted.append(key)
+
+            return changed, deleted
+
+        def flatten(data):
+            result = {}
+
+            for key in data.keys():
+                value = data[key]
+
+                if isinstance(value, dict):
+                    for name, subvalue in value.iteritems():
+                        result[(key, name)] = subvalue
+                else:
+                    result[('', key)] = value
+
+            return result
+
+        old, new = flatten(old_data), flatten(new_data)
+
+        changed = dict((key, value) for key, value in new.iteritems()
+                       if not key in old or old[key] != value)
+        deleted = [key for key in old if not key in new]
+
+        return changed, deleted
+
+    def _validate_keys(self, keys):
+        """
+        Validate only values of ``keys`` settings.
+        """
+        data = self.data
+
+        for prefix, name in sorted(keys):
+            values = data.get(prefix, {}) if prefix else data
+            available_settings = self.available_settings
+
+            if prefix:
+                if not hasattr(available_settings, prefix):
+                    continue
+                available_settings = getattr(available_settings, prefix)
+
+            if not name in values or not hasattr(available_settings, name):
+                continue
+
+            setting = getattr(available_settings, name)
+
+            if not is_settings_container(setting):
+                setting.validate(values[name])
+
+    def _lookup_key(self, data, key):
+        """
+        Return tuple of found flag and value of ``(app_name, name)`` key in
+        data.
+        """
+        prefix, name = key
+        values = data.get(prefix) if prefix else data
+
+        if not isinstance(values, (dict, DictMixin)) or not name in values:
+            return False, None
+
+        value = values[name]
+
+        if not prefix and isinstance(value, dict):
+            return False, None
+
+        return True, value
+
+    def _merge_keys(self, data, new_data, keys):
+        """
+        Return copy of ``data`` with values of ``keys`` taken from
+        ``new_data``.
+        """
+        changed, deleted = self._changes(data, new_data, keys)
+
+        if not changed and not deleted:
+            return data
+
+        data, copied = dict(data), set()
+
+        for prefix, name in changed.keys() + deleted:
+            if prefix and not prefix in copied:
+                app_data = data.get(prefix)
+                data[prefix] = \
+                    dict(app_data) if isinstance(app_data, dict) else {}
+                copied.add(prefix)
+
+        for (prefix, name), value in changed.iteritems():
+            (data[prefix] if prefix else data)[name] = value
+
+        for prefix, name in deleted:
+            (data[prefix] if prefix else data).pop(name, None)
+
+        return data
+
+    @synchronized
+    def _clear_saved(self, keys=None):
+        """
+        Clear data cache after saving values of ``keys`` (or whole data).
+
+        If values of other settings were changed, but not saved yet, current
+        data snapshot stays and only saved keys are dropped from
+        ``dirty_keys``. The snapshot is reloaded as usual, when backend finds
+        that data in the data storage changed, and unsaved values are applied
+        on top of fresh data then.
+        """
+        if keys is not None:
+            self.dirty_keys.difference_update(keys)
+
+        if keys is None or not self.dirty_keys:
+            return self.clear()
+
+        if hasattr(self, 'error'):
+            delattr(self, 'error')
+
+    def _get_data(self, check=True):
+        """
+        Return current data snapshot, loading it if necessary. If ``check`` is
+        ``False``, snapshot isn't checked for being outdated.
+        """
+        # Read reloads counter before checking snapshot, so if other thread
+        # reloads data meanwhile, it would be noticed under the lock. Data
+        # version can't be used here, as it is increased by ``set_value`` too,
+        # which doesn't read changes from the data storage
+        reloads = self.data_reloads
+        ignore_cache = self.ignore_cache if check else False
+        data = getattr(self, self.data_cache_key, None)
+
+        if data is None or ignore_cache:
+            with self.write_lock:
+                data = getattr(self, self.data_cache_key, None)
+
+                # Other thread could already reload data while this one was
+                # waiting for the lock
+                if data is None or reloads == self.data_reloads:
+                    data = self._reload()
 
         return data
+
+    def _get_notifier(self):
+        """
+        Return notifier, which listens for notifications in current process,
+        starting it if necessary.
+        """
+        notifier = getattr(self, '_notifier', None)
+
+        if notifier is None or not notifier.alive:
+            klass = get_notifier_klass(self.notifier)
+            notifier = klass(self._on_notify, **(self.notifier_options or {}))
+            notifier.start()
+
+            # Data could be changed before notifier started
+            setattr(self, '_notified', True)
+            setattr(self, '_notifier', notifier)
+
+        return notifier
+
+    def _notifier_changed(self):
+        """
+        Start notifier if it isn't started in current process yet and return
+        ``True`` if notification received since last call.
+        """
+        self._get_notifier()
+
+        # Drop flag before reading data, so notifications received while
+        # reading would not be lost
+        if getattr(self, '_notified', False):
+            setattr(self, '_notified', False)
+            return True
+
+        return False
+
+    def _on_notify(self, generation):
+        """
+        Called by notifier in background thread. Notifications about already
+        read data are ignored.
+        """
+        if generation is None or generation != self.data_generation:
+            setattr(self, '_notified', True)
+
+    def _reload(self):
+        """
+        Read data from the data storage and publish it as new data snapshot.
+        """
+        # Read generation before data, so if data would be changed while
+        # reading, next access reloads it once more
+        generation = self.generation
+        old_data = getattr(self, self.data_cache_key, None)
+
+        with stats.timer('backend.read'):
+            value = self.read()
+
+        # Lazy data converts values to Python on first access by itself
+        if not isinstance(value, LazyDict):
+            value = self._batch_method('to_python', value)
+
+        # Values changed in current process, but not saved yet, are applied
+        # on top of fresh data, so reloading never loses them
+        if self.dirty_keys and old_data is not None:
+            value = self._merge_keys(value, old_data, self.dirty_keys)
+        else:
+            self.dirty_keys = set()
+
+        self._set_data_cache(value)
+        self.data_generation = generation
+        self.data_reloads += 1
+
+        return value
+
+    def _set_data_cache(self, value):
+        """
+        Publish new data snapshot and increase data version counter.
+        """
+        setattr(self, self.data_cache_key, value)
+        self.data_version += 1
+        self.clear_lookup_cache()
@@ -1,24 +1,168 @@
-from setman.backends import SetmanBackend
-from setman.backends.django.managers import CACHE_KEY
+import datetime
+import time
+
+from django.conf import settings as django_settings
+from django.db import IntegrityError, transaction
+
+from setman.backends import SetmanBackend, synchronized
+from setman.backends.django.managers import delete_cache, get_generation, \
+    incr_generation
+from setman.utils import stats
 
 
 class Backend(SetmanBackend):
     """
     Add support of Django ORM to ``setman`` library.
+
+    Generation of settings stored in the Django cache under its own small key
+    and increased on each ``Settings`` save, so processes don't need to
+    refetch whole settings data to check that it is changed.
+
+    Saving settings costs one ``UPDATE`` query by primary key of ``Settings``
+    instance read before. Only first save, when there is no instance in
+    database yet, inserts it with fixed ``SETTINGS_PK`` primary key, so
+    several processes never create more than one instance. On partial save
+    values of passed keys are applied to data read from database first.
+
+    Settings data cached on two levels. First level is data snapshot of
+    backend instance in the process memory, second level is ``Settings``
+    instance in the Django cache (see ``SettingsManager``). By default data
+    snapshot is dropped only on saves in current process, as checking
+    generation costs one Django cache round-trip. Setup ``check_interval``
+    (in seconds) or ``SETMAN_CHECK_INTERVAL`` Django setting to check
+    generation at most once in that interval, so changes made by other
+    processes would be visible after ``check_interval`` seconds at most
+    (``0`` checks generation on each data access). Or setup
+    ``SETMAN_NOTIFIER`` Django setting to reload data only on notifications
+    from other processes.
     """
+    check_interval = None
+    partial_save = True
+    pk = None
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('check_interval',
+                          getattr(django_settings, 'SETMAN_CHECK_INTERVAL',
+                                  None))
+        kwargs.setdefault('notifier',
+                          getattr(django_settings, 'SETMAN_NOTIFIER', None))
+        kwargs.setdefault('notifier_options',
+                          getattr(django_settings, 'SETMAN_NOTIFIER_OPTIONS',
+                                  None))
+        super(Backend, self).__init__(**kwargs)
+
+    @property
+    def generation(self):
+        return get_generation()
+
+    @property
+    def ignore_cache(self):
+        if self.notifier:
+            return self._notifier_changed()
+
+        if self.check_interval is None:
+            return False
+
+        if self.check_interval:
+            now = time.time()
+
+            if now - getattr(self, '_checked_at', 0) < self.check_interval:
+                return False
+
+            setattr(self, '_checked_at', now)
+
+        return super(Backend, self).ignore_cache
+
     @property
     def instance(self):
-        from setman.backends.django.models import Settings
+        from setman.backends.django.models import SETTINGS_PK, Settings
 
         try:
             return Settings.objects.get()
         except Settings.DoesNotExist:
-            return Settings.objects.create(data={})
+            pass
 
-    def read(self):
-        return self.instance.data
+        # Empty instance doesn't change any setting, so signal handlers
+        # shouldn't clear data, which is being read right now, and increase
+        # generation
+        instance = Settings(data={}, pk=SETTINGS_PK)
+        instance._skip_clear_cache = True
+
+        # Other process could create instance first
+        if not self._insert(lambda: instance.save(force_insert=True)):
+            return Settings.objects.get()
 
-    def save(self):
+        return instance
+
+    def read(self):
         instance = self.instance
-        instance.data = self.data
-        instance.save()
+        self.pk = instance.pk
+        return instance.data
+
+    @synchronized
+    @stats.timed('backend.save')
+    def save(self, keys=None):
+        from setman.backends.django.models import SETTINGS_PK, Settings
+
+        data = self.data
+
+        if self.pk is None:
+            self.pk = self.instance.pk
+
+        # Apply only values of passed keys to data stored in database, so
+        # values saved by other processes stay
+        if keys is not None:
+            stored = Settings.objects.filter(pk=self.pk).\
+                     values_list('data', flat=True)
+            stored = Settings._meta.get_field('data').\
+                     to_python(stored[0] if stored else {})
+            data = self._merge_keys(stored or {}, data, keys)
+
+        # Don't run model validation and signal handlers here, just update
+        # data of already existed instance
+        updated = Settings.objects.filter(pk=self.pk).\
+                  update(data=data, update_date=datetime.datetime.now())
+
+        # New instance is saved with signal handlers, which also clear
+        # cache and notify other processes. If other process created instance
+        # after update above, update it once more
+        if not updated:
+            instance = Settings(data=data, pk=SETTINGS_PK)
+
+            if self._insert(lambda: instance.save(force_insert=True)):
+                self.pk = instance.pk
+                return self._clear_saved(keys)
+
+            self.pk = SETTINGS_PK
+            Settings.objects.filter(pk=self.pk).\
+                update(data=data, update_date=datetime.datetime.now())
+
+        delete_cache()
+        generation = incr_generation()
+
+        self._clear_saved(keys)
+        self.notify(generation)
+
+    def _insert(self, insert):
+        """
+        Call ``insert`` inside savepoint and return ``False`` if it violates
+        unique constraint, rolling back to savepoint.
+
+        Outside of managed transaction ``insert`` would commit by itself, so
+        savepoint would be released before ``savepoint_commit`` call. Run it
+        in its own transaction then.
+        """
+        if not transaction.is_managed():
+            with transaction.commit_on_success():
+                return self._insert(insert)
+
+        sid = transaction.savepoint()
+
+        try:
+            insert()
+        except IntegrityError:
+            transaction.savepoint_rollback(sid)
+            return False
+
+        transaction.savepoint_commit(sid)
+        return True
@@ -1,36 +1,135 @@
 import copy
+import hashlib
+import time
 
 from django.core.cache import cache
 from django.db.models import Manager
+from django.utils import simplejson
 
+from setman.utils import stats
 
-__all__ = ('SettingsManager', )
 
+__all__ = ('FrozenDict', 'SettingsManager', 'delete_cache', 'get_generation',
+           'incr_generation')
 
-CACHE_KEY = 'setman__settings'
+
+CACHE_KEY = 'setman__settings:v2'
+GENERATION_CACHE_KEY = 'setman__generation'
+
+# Previous versions cached whole ``Settings`` instance under this key
+LEGACY_CACHE_KEY = 'setman__settings'
+
+
+def delete_cache():
+    """
+    Delete cached ``Settings`` data.
+
+    Instance cached by previous versions is deleted too, so processes, which
+    aren't upgraded yet (e.g. on rolling deploy), never read stale settings.
+    """
+    cache.delete_many((CACHE_KEY, LEGACY_CACHE_KEY))
+
+
+def get_generation():
+    """
+    Read settings generation from the cache.
+
+    If there is no generation in the cache (it wasn't set yet or was evicted),
+    store current time in milliseconds there, so new value wouldn't match any
+    generation read by other processes before.
+    """
+    generation = cache.get(GENERATION_CACHE_KEY)
+
+    if generation is None:
+        cache.add(GENERATION_CACHE_KEY, int(time.time() * 1000))
+        generation = cache.get(GENERATION_CACHE_KEY)
+
+    return generation
+
+
+def incr_generation():
+    """
+    Increase settings generation in the cache.
+    """
+    try:
+        return cache.incr(GENERATION_CACHE_KEY)
+    except ValueError:
+        generation = int(time.time() * 1000)
+        cache.set(GENERATION_CACHE_KEY, generation)
+        return generation
+
+
+class FrozenDict(dict):
+    """
+    Read-only ``dict``, which shared by all ``Settings`` instances built from
+    the same cached data.
+    """
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self), ))
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('%r object is read-only' % self.__class__.__name__)
+
+    __delitem__ = __setitem__ = clear = pop = popitem = setdefault = update = \
+        _read_only
+
+    @classmethod
+    def freeze(cls, data):
+        """
+        Convert ``data`` and all app settings dicts in it to ``FrozenDict``.
+        """
+        return cls((key, cls(value) if isinstance(value, dict) else value)
+                   for key, value in data.iteritems())
 
 
 class SettingsManager(Manager):
+    """
+    Cache ``Settings`` instance in the Django cache as ``json`` dump of its
+    data with version stamp (hash of dump).
+
+    Dump is decoded at most once per version in each process, all instances
+    built from the same version share one ``FrozenDict`` with decoded data.
+    """
+    memo = (None, None)
 
     def get(self, *args, **kwargs):
-        if not CACHE_KEY in cache:
+        cached = cache.get(CACHE_KEY)
+
+        if cached is None:
+            stats.incr('django.cache_misses')
             instance = super(SettingsManager, self).get(*args, **kwargs)
+            payload = simplejson.dumps(instance.data,
+                                       cls=self.model._meta.\
+                                           get_field('data').encoder_cls)
 
-            data = copy.deepcopy(instance.data)
-            data.update({'pk': instance.pk,
-                         'create_date': instance.create_date,
-                         'update_date': instance.update_date})
+            version = hashlib.md5(payload).hexdigest()
+            cached = (version, payload, instance.pk, instance.create_date,
+                      instance.update_date)
 
-            cache.set(CACHE_KEY, data)
+            cache.set(CACHE_KEY, cached)
         else:
-            data = copy.deepcopy(cache.get(CACHE_KEY))
-            pk = data.pop('pk')
-            create_date = data.pop('create_date')
-            update_date = data.pop('update_date')
-
-            instance = self.model(data=data)
-            instance.pk = pk
-            instance.create_date = create_date
-            instance.update_date = update_date
+            stats.incr('django.cache_hits')
+
+        version, payload, pk, create_date, update_date = cached
+        memo_version, data = self.memo
+
+        if memo_version != version:
+            data = simplejson.loads(payload)
+
+            if isinstance(data, dict):
+                data = FrozenDict.freeze(data)
+
+            self.memo = (version, data)
+
+        instance = self.model(data=data)
+        instance.pk = pk
+        instance.create_date = create_date
+        instance.update_date = update_date
 
         return instance
@@ -1,4 +1,5 @@
-from django.core.cache import cache
+import copy
+
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import signals
@@ -8,10 +9,14 @@ from django.utils.encoding import force_unicode
 
 from setman import settings
 from setman.backends.django.fields import JSONField
-from setman.backends.django.managers import CACHE_KEY, SettingsManager
+from setman.backends.django.managers import FrozenDict, SettingsManager, \
+    delete_cache, incr_generation
+
+
+__all__ = ('SETTINGS_PK', 'Settings', 'SettingValue')
 
 
-__all__ = ('Settings', )
+SETTINGS_PK = 1
 
 
 class app_label_title(unicode):
@@ -58,6 +63,7 @@ class Settings(models.Model):
             return super(Settings, self).__delattr__(name)
 
         if name in self.data:
+            self.thaw()
             del self.data[name]
 
     def __getattr__(self, name):
@@ -72,6 +78,8 @@ class Settings(models.Model):
 
         if not self.data:
             self.data = {}
+
+        self.thaw()
         self.data[name] = value
 
     def __unicode__(self):
@@ -85,6 +93,14 @@ class Settings(models.Model):
                           'update_date')
         return not name.startswith('_') and not name in possible_names
 
+    def thaw(self):
+        """
+        Replace shared read-only data, got from ``SettingsManager`` cache, with
+        its copy before changing it.
+        """
+        if isinstance(self.data, FrozenDict):
+            self.data = copy.deepcopy(self.data)
+
     def validate_unique(self, exclude=None):
         """
         Check that no else ``Settings`` insances has been created.
@@ -99,15 +115,47 @@ class Settings(models.Model):
         return super(Settings, self).validate_unique(exclude)
 
 
+class SettingValue(models.Model):
+    """
+    Store value of one setting as ``json`` dump in its own row. Used by
+    ``setman.backends.django.rows`` backend.
+
+    App name for project settings is empty string.
+    """
+    app_name = models.CharField(_('app name'), blank=True, default='',
+                                max_length=64)
+    name = models.CharField(_('name'), max_length=255)
+    value = models.TextField(_('value'), blank=True, default='')
+
+    update_date = models.DateTimeField(_('updated at'), auto_now=True)
+
+    class Meta:
+        app_label = Settings._meta.app_label
+        db_table = 'setman_setting_values'
+        unique_together = ('app_name', 'name')
+        verbose_name = _('setting value')
+        verbose_name_plural = _('setting values')
+
+    def __unicode__(self):
+        if self.app_name:
+            return u'%s.%s' % (self.app_name, self.name)
+        return self.name
+
+
 @receiver(signals.post_save, sender=Settings)
 def clear_settings_cache(instance, **kwargs):
     """
-    Clear settings cache if any.
+    Clear settings cache if any and let other processes know that settings
+    were changed.
     """
-    if CACHE_KEY in cache:
-        cache.delete(CACHE_KEY)
+    if getattr(instance, '_skip_clear_cache', False):
+        return
+
+    delete_cache()
 
+    generation = incr_generation()
     settings._backend.clear()
+    settings._backend.notify(generation)
 
 
 @receiver(signals.pre_save, sender=Settings)
@@ -0,0 +1,143 @@
+import datetime
+import json
+
+from django.db import transaction
+
+from setman.backends import synchronized
+from setman.backends.django import Backend as DjangoBackend
+from setman.backends.django.managers import incr_generation
+from setman.utils import SetmanJSONEncoder, stats
+
+
+__all__ = ('Backend', )
+
+
+class Backend(DjangoBackend):
+    """
+    Store each setting value in its own ``SettingValue`` row.
+
+    On save only changed values are written and deleted values are removed,
+    so concurrent edits of different settings don't overwrite each other.
+    On partial save only values of passed keys are dumped and compared.
+
+    To enable, add next line to Django settings::
+
+        SETMAN_BACKEND = 'setman.backends.django.rows'
+
+    """
+    def __init__(self, **kwargs):
+        super(Backend, self).__init__(**kwargs)
+        self._stored_data = {}
+
+    @property
+    def model(self):
+        from setman.backends.django.models import SettingValue
+        return SettingValue
+
+    def read(self):
+        data, stored = {}, {}
+        queryset = self.model.objects.values_list('app_name', 'name', 'value')
+
+        for app_name, name, content in queryset.iterator():
+            try:
+                value = json.loads(content)
+            except ValueError:
+                continue
+
+            if app_name:
+                data.setdefault(app_name, {})[name] = value
+                stored.setdefault(app_name, {})[name] = content
+            else:
+                data[name] = value
+                stored[name] = content
+
+        # Remember values as they stored in database, so save could compare
+        # them with dumped current values and write only changed ones
+        self._stored_data = stored
+        return data
+
+    @synchronized
+    @stats.timed('backend.save')
+    def save(self, keys=None):
+        data = self.data
+
+        # Dump only values of passed keys
+        if keys is not None:
+            subset = {}
+
+            for key in keys:
+                found, value = self._lookup_key(data, key)
+
+                if not found:
+                    continue
+
+                prefix, name = key
+
+                if prefix:
+                    subset.setdefault(prefix, {})[name] = value
+                else:
+                    subset[name] = value
+
+            data = subset
+
+        dumped = self._dump_values(data)
+        changed, deleted = self._changes(self._stored_data, dumped, keys)
+
+        generation = None
+
+        if changed or deleted:
+            self._save_rows(changed, deleted)
+            generation = incr_generation()
+
+            # Data snapshot could stay after partial save, so remember saved
+            # values as stored
+            if keys is not None:
+                self._stored_data = self._merge_keys(self._stored_data,
+                                                     dumped, keys)
+
+        self._clear_saved(keys)
+
+        if generation is not None:
+            self.notify(generation)
+
+    def _dump_values(self, data):
+        dump = lambda value: json.dumps(value, cls=SetmanJSONEncoder)
+        result = {}
+
+        for key, value in data.iteritems():
+            if isinstance(value, dict):
+                result[key] = dict((name, dump(subvalue))
+                                   for name, subvalue in value.iteritems())
+            else:
+                result[key] = dump(value)
+
+        return result
+
+    @transaction.commit_on_success
+    def _save_rows(self, changed, deleted):
+        manager, created = self.model.objects, []
+        now = datetime.datetime.now()
+
+        for (app_name, name), value in changed.iteritems():
+            updated = manager.filter(app_name=app_name, name=name).\
+                              update(value=value, update_date=now)
+
+            if not updated:
+                created.append(self.model(app_name=app_name, name=name,
+                                          value=value))
+
+        # Django 1.3 doesn't support ``bulk_create``
+        if created and hasattr(manager, 'bulk_create'):
+            if self._insert(lambda: manager.bulk_create(created)):
+                created = []
+
+        # Other process could insert same rows after update above, so
+        # insert each row in its own savepoint and update it on conflict
+        for instance in created:
+            if not self._insert(lambda: instance.save(force_insert=True)):
+                manager.filter(app_name=instance.app_name,
+                               name=instance.name).\
+                        update(value=instance.value, update_date=now)
+
+        for app_name, name in deleted:
+            manager.filter(app_name=app_name, name=name).delete()
@@ -1,6 +1,9 @@
+import errno
 import json
+import mmap
 import os
 import re
+import time
 
 try:
     import cPickle as pickle
@@ -12,11 +15,14 @@ try:
 except ImportError:
     from StringIO import StringIO
 
-from setman.backends import SetmanBackend
+from setman.backends import SetmanBackend, synchronized
 from setman.exceptions import ImproperlyConfigured, ValidationError
-from setman.utils import ConfigParser, SetmanJSONEncoder, logger
+from setman.utils import ConfigParser, SetmanJSONEncoder, binary, logger, \
+    stats
 from setman.utils.ordereddict import OrderedDict
+from setman.utils.files import atomic_write, file_lock
 from setman.utils.parsing import is_settings_container
+from setman.utils.watchers import get_watcher_klass
 
 
 FilnameError = ImproperlyConfigured('Please, supply ``filename`` instance ' \
@@ -26,18 +32,69 @@ FilnameError = ImproperlyConfigured('Please, supply ``filename`` instance ' \
 class Backend(SetmanBackend):
     """
     Backend to read and write settings values to text file using one of
-    supported formats: 'ini', 'json', 'pickle'.
+    supported formats: 'ini', 'json', 'pickle' or 'binary'.
 
     Default format is 'json'.
 
+    Settings file in 'binary' format starts with index of all stored values
+    and is read via ``mmap``, so each value is decoded only on first access
+    to it. Use it for large settings files, when only some of values are read
+    by the process.
+
     You should setup ``filename`` attribute to the backend, otherwise
     ``ImproperlyConfigured`` error would be raised.
+
+    Generation counter of settings file stored in sidecar file, which path is
+    ``filename`` with ``generation_suffix``.
+
+    If ``journal`` is ``True``, each save only appends changed values to the
+    journal file (``filename`` with ``journal_suffix``), which is replayed on
+    reading. When journal contains more than ``journal_max_records`` records
+    or its size exceeds ``journal_max_size`` bytes, it is compacted into the
+    settings file.
+
+    Settings file is saved atomically: content is written to the temporary
+    file first, which then renamed to ``filename``. So readers never see
+    partially written file and don't need any locks, while writers from all
+    processes are serialized by advisory lock on the file, which path is
+    ``filename`` with ``lock_suffix``.
+
+    By default, status of settings file is checked for changes on each data
+    access (see ``is_changed``). To decrease number of filesystem calls, you
+    could:
+
+    * Setup ``check_interval`` (in seconds) to check files at most once in
+      that interval.
+    * Setup ``watch`` to ``'poll'`` to check files in background thread
+      every ``watch_interval`` seconds (1 by default), to ``'inotify'`` to
+      listen for ``inotify`` events (needs ``pyinotify`` library) or to
+      ``True`` to use ``inotify`` when it's available. In this mode reading
+      settings doesn't touch filesystem at all.
+    * Setup ``notifier`` to reload data only on notifications from other
+      processes (see ``SetmanBackend``).
+
+    On partial save only values of passed keys are written: in journal mode
+    they are appended to the journal, otherwise they are applied to the
+    current content of settings file, so values saved by other processes
+    are kept. Without journal partial save reads and decodes settings file
+    before writing it, so it costs more than full save.
+
     """
+    check_interval = None
     encoder_cls = SetmanJSONEncoder
     format = 'json'
     filename = None
     filemode_to_read = 'r'
     filemode_to_save = 'w+'
+    generation_suffix = '.generation'
+    journal = False
+    journal_max_records = 100
+    journal_max_size = 1024 * 1024
+    journal_suffix = '.journal'
+    lock_suffix = '.lock'
+    partial_save = True
+    watch = None
+    watch_interval = None
 
     def __init__(self, **kwargs):
         super(Backend, self).__init__(**kwargs)
@@ -76,72 +133,177 @@ class Backend(SetmanBackend):
             return json.dumps(data, **kwargs)
         elif self.format == 'pickle':
             return pickle.dumps(data)
+        elif self.format == 'binary':
+            return binary.dumps(data)
 
         raise ImproperlyConfigured('File format %r is not supported.' % \
                                    self.format)
 
     @property
-    def ignore_cache(self):
-        if hasattr(self, 'disable_ignore_cache'):
-            return False
+    def generation(self):
+        """
+        Read generation counter from sidecar file.
+        """
+        if not self.filename:
+            return None
 
         try:
-            mtime = os.path.getmtime(self.filename)
+            handler = open(self.generation_filename, 'r')
         except (IOError, OSError):
-            mtime = None
+            return None
+
+        content = handler.read()
+        handler.close()
+
+        try:
+            return int(content)
+        except ValueError:
+            return None
+
+    @property
+    def generation_filename(self):
+        return self.filename + self.generation_suffix
+
+    @property
+    def journal_filename(self):
+        return self.filename + self.journal_suffix
+
+    @property
+    def lock_filename(self):
+        return self.filename + self.lock_suffix
+
+    @property
+    def ignore_cache(self):
+        if self.notifier:
+            return self._notifier_changed()
+
+        if self.watch:
+            return self._watcher_changed()
+
+        if self.check_interval:
+            now = time.time()
+
+            if now - getattr(self, '_checked_at', 0) < self.check_interval:
+                return False
+
+            setattr(self, '_checked_at', now)
+
+        return self.is_changed()
+
+    def is_changed(self):
+        """
+        Check whether settings file was changed after last data reading.
+
+        Usually check costs only one ``stat`` call (two in journal mode), as
+        generation sidecar file is read only on first check. After that
+        settings file treated as changed when its modification time, size or
+        inode changed.
+        """
+        # Settings file could be changed by someone else than setman, so check
+        # its status instead of generation only
+        signature = self._file_signature()
 
-        if not mtime:
+        if signature is None:
             return False
 
-        old_mtime = getattr(self, '_mtime_cache', None)
-        setattr(self, '_mtime_cache', mtime)
+        old_signature = getattr(self, '_signature_cache', None)
+        setattr(self, '_signature_cache', signature)
 
-        if old_mtime and mtime != old_mtime:
-            return True
+        # Check runs on every setting read, so don't take stats lock for it
+        stats.fast_incr('filebased.checks')
 
-        return False
+        if old_signature is None:
+            changed = super(Backend, self).ignore_cache
+        else:
+            changed = signature != old_signature
+
+        if changed:
+            stats.incr('filebased.changes')
+
+        return changed
 
     def read(self):
         if not self.filename:
             raise FilenameError
 
-        try:
-            handler = open(self.filename, self.filemode_to_read)
-        except (IOError, OSError), e:
-            message = 'Cannot open %r file for read in %r mode' % \
-                      (self.filename, self.filemode_to_read)
-            logger.error(message)
-
-            return {}
+        if not self.journal:
+            return self._read_file()
 
-        content = handler.read()
-        handler.close()
+        # Journal should be read before settings file. Journal compaction
+        # replaces settings file first, so replaying previous journal over new
+        # settings file still gives the same data
+        records = self._read_journal()
+        data = self._replay_journal(self._read_file(), records)
 
-        return self.to_python(content)
+        setattr(self, '_journal_data', data)
+        return data
 
-    def save(self):
+    @synchronized
+    @stats.timed('backend.save')
+    def save(self, keys=None):
         if not self.filename:
             raise FilenameError
 
-        try:
-            handler = open(self.filename, self.filemode_to_save)
-        except (IOError, OSError), e:
-            message = 'Cannot open %r file for write in %r mode' % \
-                      (self.filename, self.filemode_to_save)
-            logger.error(message)
+        # Save current snapshot as is, without reloading it
+        data = self._get_data(check=False)
 
-            raise e
+        if not self.journal and keys is None:
+            content = self.from_python(data)
 
-        setattr(self, 'disable_ignore_cache', True)
-        content = self.from_python(self.data)
-        delattr(self, 'disable_ignore_cache')
+        with file_lock(self.lock_filename):
+            try:
+                if not self.journal:
+                    # Apply only values of passed keys to the current file
+                    # content, so values saved by other processes stay
+                    if keys is not None:
+                        data = self._merge_keys(self._read_file(), data, keys)
+                        content = self.from_python(data)
 
-        handler.write(content)
-        handler.close()
+                    atomic_write(self.filename, content, self.filemode_to_save)
+                elif not os.path.isfile(self.filename):
+                    self._compact_journal(data)
+                else:
+                    self._save_journal(data, keys)
+            except (IOError, OSError), e:
+                message = 'Cannot write settings to %r file' % self.filename
+                logger.error(message)
+
+                raise e
+
+            generation = self.save_generation()
 
         # After writing data to file, clear all previous data cache and clear
         # validation error if any
-        self.clear()
+        self._clear_saved(keys)
+        self.notify(generation)
+
+    def stop_watcher(self):
+        """
+        Stop background watcher if any.
+        """
+        watcher = getattr(self, '_watcher', None)
+
+        if watcher is not None:
+            watcher.stop()
+            delattr(self, '_watcher')
+
+    def save_generation(self):
+        """
+        Increase generation counter in sidecar file. Should be called only
+        while holding lock on settings file.
+        """
+        generation = (self.generation or 0) + 1
+
+        try:
+            atomic_write(self.generation_filename, str(generation))
+        except (IOError, OSError), e:
+            message = 'Cannot write generation to %r file' % \
+                      self.generation_filename
+            logger.error(message)
+
+            raise e
+
+        return generation
 
     def to_python(self, content):
         data = None
@@ -168,6 +330,8 @@ class Backend(SetmanBackend):
                 data = {}
         elif self.format == 'pickle':
             data = pickle.loads(content)
+        elif self.format == 'binary':
+            return binary.loads(content, self._to_python_value)
 
         if data is None:
             raise ImproperlyConfigured('File format %r is not supported.' % \
@@ -175,6 +339,254 @@ class Backend(SetmanBackend):
 
         return self._batch_method('to_python', data)
 
+    def _compact_journal(self, data=None):
+        """
+        Write all data from settings file and journal to the settings file and
+        empty the journal. Should be called only while holding lock on
+        settings file.
+        """
+        if data is None:
+            data = self._replay_journal(self._read_file(),
+                                        self._read_journal())
+
+        atomic_write(self.filename, self.from_python(data),
+                     self.filemode_to_save)
+        atomic_write(self.journal_filename, '')
+
+    def _file_signature(self):
+        """
+        Return tuple of modification time, size and inode of settings file
+        (and of journal file in journal mode) or ``None`` if settings file
+        doesn't exist.
+        """
+        try:
+            stat = os.stat(self.filename)
+        except (IOError, OSError):
+            return None
+
+        signature = (stat.st_mtime, stat.st_size, stat.st_ino)
+
+        if self.journal:
+            try:
+                stat = os.stat(self.journal_filename)
+            except (IOError, OSError):
+                return signature
+
+            signature += (stat.st_mtime, stat.st_size, stat.st_ino)
+
+        return signature
+
+    def _journal_delta(self, old_data, new_data, keys=None):
+        """
+        Return journal record with values changed or deleted in ``new_data``
+        comparing to ``old_data``. If ``keys`` passed, only values of these
+        keys are compared.
+        """
+        changed, deleted = self._changes(old_data, new_data, keys)
+        record = {}
+
+        for (prefix, name), value in changed.iteritems():
+            record.setdefault('set', {}).setdefault(prefix, {})[name] = value
+
+        for prefix, name in deleted:
+            record.setdefault('delete', {}).setdefault(prefix, []).append(name)
+
+        return record
+
+    def _mmap(self, handler):
+        """
+        Map settings file to memory. Memory map stays valid even after
+        settings file would be replaced by next save.
+        """
+        if not os.fstat(handler.fileno()).st_size:
+            return ''
+
+        return mmap.mmap(handler.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _on_change(self):
+        setattr(self, '_changed', True)
+
+    def _watcher_changed(self):
+        """
+        Start watcher if it isn't started in current process yet and return
+        ``True`` if watcher found changes since last call.
+        """
+        watcher = getattr(self, '_watcher', None)
+
+        if watcher is None or not watcher.alive:
+            klass = get_watcher_klass(self.watch)
+            watcher = klass((self.filename, self.generation_filename),
+                            self._on_change,
+                            self.watch_interval)
+            watcher.start()
+
+            setattr(self, '_changed', False)
+            setattr(self, '_watcher', watcher)
+
+            # Files could be changed before watcher started
+            return self.is_changed()
+
+        # Drop flag before reading data, so changes found by watcher while
+        # reading would not be lost
+        if getattr(self, '_changed', False):
+            setattr(self, '_changed', False)
+            return True
+
+        return False
+
+    def _read_file(self):
+        """
+        Read data from settings file only.
+        """
+        try:
+            handler = open(self.filename, self.filemode_to_read)
+        except (IOError, OSError), e:
+            message = 'Cannot open %r file for read in %r mode' % \
+                      (self.filename, self.filemode_to_read)
+            logger.error(message)
+
+            # Settings file not exists yet, it's okay
+            if e.errno == errno.ENOENT:
+                return {}
+
+            raise e
+
+        if self.format == 'binary':
+            content = self._mmap(handler)
+        else:
+            content = handler.read()
+
+        handler.close()
+
+        return self.to_python(content)
+
+    def _read_journal(self):
+        """
+        Read all records from the journal file. Partially written last record
+        is ignored.
+        """
+        try:
+            handler = open(self.journal_filename, 'r')
+        except (IOError, OSError), e:
+            if e.errno == errno.ENOENT:
+                return []
+            raise e
+
+        inode = os.fstat(handler.fileno()).st_ino
+        content = handler.read()
+        handler.close()
+
+        # Remember journal size and number of records in it, so save counts
+        # only records appended after that
+        setattr(self, '_journal_position',
+                (inode, len(content), content.count('\n')))
+
+        kwargs = self._prepare_json_kwargs(loads=True)
+        records = []
+
+        for line in content.split('\n')[:-1]:
+            try:
+                records.append(json.loads(line, **kwargs))
+            except ValueError:
+                logger.exception('Cannot parse journal record %r', line)
+
+        return records
+
+    def _replay_journal(self, data, records):
+        """
+        Apply journal records to the data read from settings file.
+        """
+        if not records:
+            return data
+
+        data, copied = dict(data), set()
+
+        for record in records:
+            for prefix, values in record.get('set', {}).iteritems():
+                if prefix and not prefix in copied:
+                    app_data = data.get(prefix)
+                    data[prefix] = \
+                        dict(app_data) if isinstance(app_data, dict) else {}
+                    copied.add(prefix)
+
+                target = data[prefix] if prefix else data
+
+                for name, value in values.iteritems():
+                    target[name] = \
+                        self._to_python_value(name, value, prefix or None)
+
+            for prefix, names in record.get('delete', {}).iteritems():
+                if prefix and not prefix in copied:
+                    if not isinstance(data.get(prefix), dict):
+                        continue
+
+                    data[prefix] = dict(data[prefix])
+                    copied.add(prefix)
+
+                target = data[prefix] if prefix else data
+
+                for name in names:
+                    target.pop(name, None)
+
+        return data
+
+    def _save_journal(self, data, keys=None):
+        """
+        Append values changed after last reading (only values of ``keys`` if
+        passed) to the journal and compact it if necessary. Should be called
+        only while holding lock on settings file.
+        """
+        record = self._journal_delta(getattr(self, '_journal_data', {}),
+                                     data, keys)
+
+        handler = open(self.journal_filename, 'a+')
+
+        try:
+            status = os.fstat(handler.fileno())
+            inode, size, records = \
+                getattr(self, '_journal_position', None) or (None, 0, 0)
+
+            # Journal was compacted after last reading, count all its records
+            if inode != status.st_ino or size > status.st_size:
+                size = records = 0
+
+            # Count only records appended by other processes after last
+            # reading, so save cost doesn't depend on journal size
+            if size < status.st_size:
+                handler.seek(size)
+                records += handler.read(status.st_size - size).count('\n')
+
+            size = status.st_size
+
+            if record:
+                kwargs = self._prepare_json_kwargs(dumps=True)
+                line = json.dumps(record, **kwargs) + '\n'
+
+                # Writer, which crashed in the middle of record, left partial
+                # line. End it first, so new record isn't glued to it
+                if status.st_size:
+                    handler.seek(status.st_size - 1)
+
+                    if handler.read(1) != '\n':
+                        line = '\n' + line
+                        records += 1
+
+                handler.seek(0, os.SEEK_END)
+                handler.write(line)
+                handler.flush()
+                os.fsync(handler.fileno())
+
+                records += 1
+                size += len(line)
+        finally:
+            handler.close()
+
+        setattr(self, '_journal_position', (status.st_ino, size, records))
+
+        if records >= self.journal_max_records or \
+           size >= self.journal_max_size:
+            self._compact_journal()
+
     def _prepare_json_kwargs(self, dumps=False, loads=False):
         assert dumps or loads, 'Please, supply ``dumps`` or ``loads`` ' \
                                'keyword argument first.'
@@ -39,17 +39,24 @@ class SetmanFramework(object):
     field_klasses = None
     field_name_separator = '.'
     settings = type('SetmanSettings', (object, ), {})
+    settings_cache_file = None
+    stats = True
     ValidationError = ValidationError
 
     def __init__(self, settings_file=None, settings_files=None,
-                 default_values_file=None, additional_types=None, **kwargs):
+                 default_values_file=None, additional_types=None,
+                 settings_cache_file=None, stats=True, **kwargs):
         """
         Setup necessary params for setman supported framework.
+
+        If ``stats`` is ``False``, ``setman`` wouldn't record any stats.
         """
         self.additional_types = additional_types
         self.default_values_file = default_values_file
+        self.settings_cache_file = settings_cache_file
         self.settings_file = settings_file
         self.settings_files = settings_files
+        self.stats = stats
         self.fail_silently = kwargs.pop('fail_silently', True)
 
         if 'default_backend' in kwargs:
@@ -60,24 +67,88 @@ class SetmanFramework(object):
 
         self.__dict__.update(kwargs)
 
-    def build_form_fields(self, available_settings=None, fields=None):
+    def build_form_fields(self, available_settings=None, fields=None,
+                          initial=None):
         """
         Build fields from list of availabale settings.
+
+        Initial values of fields are read from ``initial`` dict by field
+        names. If it isn't passed, initial values are read from one backend
+        data snapshot (see ``get_initial_values``).
         """
         from setman import settings
 
         available_settings = available_settings or settings.available_settings
         fields = fields or OrderedDict()
 
+        if initial is None:
+            initial = self.get_initial_values(available_settings)
+
         for setting in available_settings:
             if is_settings_container(setting):
-                fields = self.build_form_fields(setting, fields)
+                fields = self.build_form_fields(setting, fields, initial)
             else:
-                field = settings._framework.setting_to_field(setting)
+                name = self.setting_field_name(setting)
+                field = self.setting_to_field(setting,
+                                              initial=initial.get(name))
                 fields[field.name] = field
 
         return fields
 
+    def get_form_fields(self):
+        """
+        Return unbound form fields for all available settings without initial
+        values.
+
+        Fields are built only once for each available settings instance, so
+        initial values should be passed to the form separately (see
+        ``get_initial_values``).
+        """
+        from setman import settings
+
+        available_settings = settings.available_settings
+        cached = getattr(self, '_form_fields_cache', None)
+
+        if cached is None or cached[0] is not available_settings:
+            fields = self.build_form_fields(available_settings, initial={})
+            cached = (available_settings, fields)
+            setattr(self, '_form_fields_cache', cached)
+
+        return cached[1]
+
+    def get_initial_values(self, available_settings=None, initial=None,
+                           data=None):
+        """
+        Return dict of initial values for all form fields by field names.
+
+        All values are read from one backend ``data`` snapshot, so backend
+        data is accessed only once for all fields.
+        """
+        from setman import settings
+        from setman.lazy import LazySettings
+
+        available_settings = available_settings or settings.available_settings
+        initial = {} if initial is None else initial
+
+        if data is None:
+            data = settings._backend.data
+
+        if available_settings.app_name:
+            values = LazySettings(available_settings,
+                                  available_settings.app_name,
+                                  settings)
+        else:
+            values = settings
+
+        for setting in available_settings:
+            if is_settings_container(setting):
+                self.get_initial_values(setting, initial, data)
+            else:
+                name = self.setting_field_name(setting)
+                initial[name] = values._resolve(data, setting.name)
+
+        return initial
+
     def get_additional_types(self):
         """
         Return tuple of additional types that would be supported when parsing
@@ -123,18 +194,18 @@ class SetmanFramework(object):
 
     def save_form_fields(self, data):
         """
+        Set all form fields values to the settings in one batch and save them.
         """
         from setman import settings
         sep = self.field_name_separator
 
-        for key, value in data.items():
-            if sep in key:
-                app_name, key = key.split(sep, 1)
-                setattr(getattr(settings, app_name), key, value)
-            else:
-                setattr(settings, key, value)
-
-        settings.save()
+        with settings.batch(save=True):
+            for key, value in data.items():
+                if sep in key:
+                    app_name, key = key.split(sep, 1)
+                    setattr(getattr(settings, app_name), key, value)
+                else:
+                    setattr(settings, key, value)
 
     def setting_field_klass(self, setting):
         """
@@ -164,20 +235,29 @@ class SetmanFramework(object):
             value = kwargs[arg] if arg in kwargs else getattr(setting, arg)
             field_kwargs.update({arg: value})
 
+        # Setting validators list is cached and shared, so field should get
+        # its copy
+        if field_kwargs.get('validators') is not None:
+            field_kwargs['validators'] = list(field_kwargs['validators'])
+
         field_kwargs.update(**setting.get_field_kwargs())
         field_kwargs = self.translate_field_kwargs(field_kwargs)
 
         field = field_klass(**field_kwargs)
         field.app_name = setting.app_name
         field.name_app = setting.app_name[::-1] if setting.app_name else None
+        field.name = self.setting_field_name(setting)
 
+        return field
+
+    def setting_field_name(self, setting):
+        """
+        Return form field name for the specified setting.
+        """
         if setting.app_name:
             sep = self.field_name_separator
-            field.name = sep.join((setting.app_name, setting.name))
-        else:
-            field.name = setting.name
-
-        return field
+            return sep.join((setting.app_name, setting.name))
+        return setting.name
 
     def translate_field_kwargs(self, kwargs):
         """
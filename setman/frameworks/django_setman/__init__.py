@@ -38,8 +38,10 @@ class Framework(SetmanFramework):
             'auth_permitted_func': conf('SETMAN_AUTH_PERMITTED',
                                         self.auth_permitted_func),
             'default_values_file': conf('SETMAN_DEFAULT_VALUES_FILE'),
+            'settings_cache_file': conf('SETMAN_SETTINGS_CACHE_FILE'),
             'settings_file': conf('SETMAN_SETTINGS_FILE'),
             'settings_files': conf('SETMAN_SETTINGS_FILES', {}),
+            'stats': conf('SETMAN_STATS', True),
         }
         defaults.update(kwargs)
 
@@ -92,14 +94,19 @@ class Framework(SetmanFramework):
             return django_forms.RegexField
         return super(Framework, self).setting_field_klass(setting)
 
-    def setting_to_field(self, setting):
+    def setting_to_field(self, setting, **kwargs):
         """
         """
-        field = super(Framework, self).setting_to_field(setting)
+        field = super(Framework, self).setting_to_field(setting, **kwargs)
 
-        if setting.builtin_validators:
-            field.validators = \
-                list(set(setting.validators).\
-                     difference(set(setting.builtin_validators)))
+        # Django form fields add their own validators for setting builtin
+        # ones (max value, regex, etc), so remove builtin validators of setting
+        loaded_validators = setting.loaded_validators
+        builtin_validators = [validator for validator in setting.validators
+                              if not validator in loaded_validators]
+
+        if builtin_validators:
+            field.validators = [validator for validator in field.validators
+                                if not validator in builtin_validators]
 
         return field
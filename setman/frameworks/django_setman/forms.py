@@ -1,3 +1,5 @@
+import copy
+
 from django import forms
 from django.utils.datastructures import SortedDict
 from django.utils.encoding import force_unicode
@@ -13,9 +15,17 @@ class SettingsForm(forms.Form):
         """
         Read all available settings from configuration definition file and
         add field for each setting to the form.
+
+        Unbound fields are built once and cached by framework, form gets their
+        copies and only initial values are read on each form initialization.
         """
+        framework = settings._framework
+
+        if kwargs.get('initial') is None:
+            kwargs['initial'] = framework.get_initial_values()
+
         super(SettingsForm, self).__init__(*args, **kwargs)
-        self.fields = settings._framework.build_form_fields()
+        self.fields = copy.deepcopy(framework.get_form_fields())
 
     def save(self):
         """
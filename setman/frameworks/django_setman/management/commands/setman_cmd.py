@@ -12,7 +12,7 @@ from django.core.management.base import NoArgsCommand
 
 from setman import settings
 from setman.frameworks.django_setman.models import Settings
-from setman.utils.parsing import is_settings_container
+from setman.utils.parsing import is_settings_container, parse_configs
 
 
 AVAILABLE_SETTINGS = settings.available_settings
@@ -29,6 +29,13 @@ class Command(NoArgsCommand):
         make_option('-d', '--default-values', action='store_true',
             default=False, dest='default_values',
             help='Store default values to Settings model.'),
+        make_option('-c', '--cache', action='store_true', default=False,
+            dest='cache',
+            help='Parse configuration definition files and store result to ' \
+                 'settings cache file.'),
+        make_option('-s', '--stats', action='store_true', default=False,
+            dest='stats',
+            help='Print setman stats recorded in current process.'),
     )
 
     def check_setman(self, verbosity):
@@ -64,14 +71,46 @@ class Command(NoArgsCommand):
         """
         Do all necessary things.
         """
+        cache = options.get('cache', False)
         default_values = options.get('default_values', False)
+        show_stats = options.get('stats', False)
         verbosity = int(options.get('verbosity', 1))
 
         self.check_setman(verbosity)
 
+        if cache:
+            self.store_settings_cache(verbosity)
+
         if default_values:
             self.store_default_values(verbosity)
 
+        if show_stats:
+            self.print_stats()
+
+    def print_stats(self):
+        """
+        Print counters and timers recorded by setman in current process.
+        """
+        data = settings.stats()
+
+        if data is None:
+            print >> self.stdout, 'Setman stats are disabled. Please, ' \
+                                  'remove ``SETMAN_STATS = False`` from ' \
+                                  'settings first.'
+            return
+
+        print >> self.stdout, 'Setman stats:'
+
+        for name, value in sorted(data['counters'].iteritems()):
+            print >> self.stdout, '    %s: %d' % (name, value)
+
+        for name, timer in sorted(data['timers'].iteritems()):
+            print >> self.stdout, '    %s: %d calls, %.2f msec total, ' \
+                                  '%.2f msec average' % \
+                                  (name, timer['calls'],
+                                   timer['total'] * 1000,
+                                   timer['average'] * 1000)
+
     def store_default_values(self, verbosity):
         """
         Store default values to Settings instance.
@@ -89,3 +128,23 @@ class Command(NoArgsCommand):
 
         if verbosity:
             print >> self.stdout, 'Default values stored well!'
+
+    def store_settings_cache(self, verbosity):
+        """
+        Parse configuration definition files and store result to settings
+        cache file.
+        """
+        framework = settings._framework
+
+        if not framework.settings_cache_file:
+            if verbosity:
+                print >> self.stdout, 'Settings cache file is not set. ' \
+                                      'Please, setup ' \
+                                      '``SETMAN_SETTINGS_CACHE_FILE`` first.'
+            return
+
+        parse_configs(framework, use_cache=False)
+
+        if verbosity:
+            print >> self.stdout, 'Parsed settings stored to %r' % \
+                                  framework.settings_cache_file
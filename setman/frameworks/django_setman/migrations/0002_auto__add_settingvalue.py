@@ -0,0 +1,52 @@
+# encoding: utf-8
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        
+        # Adding model 'SettingValue'
+        db.create_table('setman_setting_values', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('app_name', self.gf('django.db.models.fields.CharField')(default='', max_length=64, blank=True)),
+            ('name', self.gf('django.db.models.fields.CharField')(max_length=255)),
+            ('value', self.gf('django.db.models.fields.TextField')(default='', blank=True)),
+            ('update_date', self.gf('django.db.models.fields.DateTimeField')(auto_now=True, blank=True)),
+        ))
+        db.send_create_signal('django_setman', ['SettingValue'])
+
+        # Adding unique constraint on 'SettingValue', fields ['app_name', 'name']
+        db.create_unique('setman_setting_values', ['app_name', 'name'])
+
+
+    def backwards(self, orm):
+        
+        # Removing unique constraint on 'SettingValue', fields ['app_name', 'name']
+        db.delete_unique('setman_setting_values', ['app_name', 'name'])
+
+        # Deleting model 'SettingValue'
+        db.delete_table('setman_setting_values')
+
+
+    models = {
+        'django_setman.settings': {
+            'Meta': {'object_name': 'Settings', 'db_table': "'setman_settings'"},
+            'create_date': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'data': ('setman.backends.django.fields.JSONField', [], {'default': "''", 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'update_date': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'django_setman.settingvalue': {
+            'Meta': {'unique_together': "(('app_name', 'name'),)", 'object_name': 'SettingValue', 'db_table': "'setman_setting_values'"},
+            'app_name': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '64', 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'update_date': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'value': ('django.db.models.fields.TextField', [], {'default': "''", 'blank': 'True'})
+        }
+    }
+
+    complete_apps = ['django_setman']
@@ -45,8 +45,10 @@ class Framework(SetmanFramework):
                                         'SETMAN_AUTH_PERMITTED',
                                         self.auth_permitted_func),
             'default_values_file': conf(app, 'SETMAN_DEFAULT_VALUES_FILE'),
+            'settings_cache_file': conf(app, 'SETMAN_SETTINGS_CACHE_FILE'),
             'settings_file': conf(app, 'SETMAN_SETTINGS_FILE'),
             'settings_files': conf(app, 'SETMAN_SETTINGS_FILES', {}),
+            'stats': conf(app, 'SETMAN_STATS', True),
         }
         defaults.update(kwargs)
 
@@ -22,9 +22,10 @@ def edit():
         return Response(output, status=403)
 
     settings_form = settings_form_factory()
+    initial = settings._framework.get_initial_values()
 
     if request.method == 'POST':
-        form = settings_form(request.form)
+        form = settings_form(request.form, **initial)
 
         if form.validate():
             form.save()
@@ -33,7 +34,7 @@ def edit():
             return redirect('%s?%d' % (url_for('setman.edit'),
                                        randint(1000, 9999)))
     else:
-        form = settings_form()
+        form = settings_form(**initial)
 
     return render_template('setman/edit.html', form=update_form_fields(form))
 
@@ -25,11 +25,27 @@ def settings_form_factory():
     """
     We should dynamically add fields to the form, not only one time before
     server reload.
+
+    Form class is built once for each available settings instance and has no
+    initial values, so pass them on form initialization::
+
+        form = settings_form_factory()(**framework.get_initial_values())
+
     """
+    framework = settings._framework
+    available_settings = settings.available_settings
+    cached = getattr(framework, '_settings_form_cache', None)
+
+    if cached is not None and cached[0] is available_settings:
+        return cached[1]
+
     SettingsForm = type('SettingsForm', (BaseSettingsForm, ), {})
-    fields = settings._framework.build_form_fields()
+    fields = framework.get_form_fields()
 
     for name, field in fields.iteritems():
         setattr(SettingsForm, name, field)
 
+    setattr(framework, '_settings_form_cache',
+            (available_settings, SettingsForm))
+
     return SettingsForm
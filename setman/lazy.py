@@ -1,9 +1,7 @@
-import copy
-
 from setman.backends import SetmanBackend
 from setman.exceptions import ImproperlyConfigured, SettingDoesNotExist
 from setman.frameworks import SetmanFramework
-from setman.utils import importlib, logger
+from setman.utils import importlib, logger, stats
 from setman.utils.parsing import is_settings_container, parse_configs
 
 
@@ -34,19 +32,41 @@ class LazySettings(object):
             return super(LazySettings, self).__delattr__(name)
 
         if name == 'available_settings':
-            del self._available_settings_cache
+            delattr(self, '_available_settings_cache')
+
+            if self._backend:
+                self._backend.clear_lookup_cache()
+
+            return
 
         if not self._configured:
             self.autoconf()
 
+        backend, prefix = self._backend, self._prefix
         framework_settings = self._framework.settings
 
         if hasattr(framework_settings, name):
             delattr(framework_settings, name)
-        elif name in self._backend.data:
-            del self._backend.data[name]
-
-        raise SettingDoesNotExist(name)
+            return backend.clear_lookup_cache()
+
+        # Read and replace data under the lock, so concurrent writes from
+        # other threads are not lost
+        with backend.write_lock:
+            data = backend.data
+
+            # Never change backend data snapshot in place, delete setting from
+            # its copy instead
+            if prefix and name in data.get(prefix, {}):
+                data = dict(data)
+                data[prefix] = dict(data[prefix])
+                del data[prefix][name]
+            elif not prefix and name in data:
+                data = dict(data)
+                del data[name]
+            else:
+                raise SettingDoesNotExist(name)
+
+            backend.data = data
 
     def __getattr__(self, name):
         """
@@ -55,6 +75,10 @@ class LazySettings(object):
         For first try, method tries to read settings from database, then from
         Django settings and if all fails try to return default value of
         available setting from configuration definition file if any.
+
+        Resolved values are cached by backend until its data changes. Values
+        read from framework settings are never cached, as framework settings
+        could be changed directly (e.g. by Django ``override_settings``).
         """
         if name.startswith('_'):
             return super(LazySettings, self).__getattr__(name)
@@ -65,29 +89,25 @@ class LazySettings(object):
         if not self._configured:
             self.autoconf()
 
-        data, prefix = copy.deepcopy(self._backend.data), self._prefix
-        framework_settings = self._framework.settings
+        # Backend data is a shared snapshot, which never changes in place, so
+        # there is no need to copy it before reading
+        data, lookup_cache = self._backend.snapshot()
+        cache_key = (self._prefix, name)
 
-        # Read app setting from database
-        if prefix and prefix in data and name in data[prefix]:
-            return data[prefix][name]
-        # Read project setting from database
-        elif name in data and not isinstance(data[name], dict):
-            return data[name]
-        # Or from framework settings
-        elif hasattr(framework_settings, name):
-            return getattr(framework_settings, name)
-        # Or read default value from available settings
-        elif hasattr(self._settings, name):
-            mixed = getattr(self._settings, name)
+        # Resolved values stay in lookup cache until backend publishes next
+        # data snapshot, so reading hot setting costs one dict lookup
+        try:
+            return lookup_cache[cache_key]
+        except KeyError:
+            pass
 
-            if is_settings_container(mixed):
-                return LazySettings(mixed, name, self)
+        stats.incr('lazy.lookup_misses')
+        value = self._resolve(data, name)
 
-            return mixed.default
+        if self._cacheable(data, name):
+            lookup_cache[cache_key] = value
 
-        # If cannot read setting - raise error
-        raise SettingDoesNotExist(name)
+        return value
 
     def __setattr__(self, name, value):
         """
@@ -99,22 +119,70 @@ class LazySettings(object):
         if not self._configured:
             self.autoconf()
 
-        data, prefix = copy.deepcopy(self._backend.data), self._prefix
         framework_settings = self._framework.settings
 
         # First of all try to setup value to framework setting
         if hasattr(framework_settings, name):
             setattr(framework_settings, name, value)
-        # Then setup value to project setting
-        elif not prefix:
-            data[name] = value
-        # And finally setup value to app setting
-        else:
-            if not prefix in data:
-                data[prefix] = {}
-            data[prefix][name] = value
+            return self._backend.clear_lookup_cache()
+
+        # Then setup value to project or app setting
+        self._backend.set_value(name, value, self._prefix)
+
+    def aget(self, name):
+        """
+        Return future with setting value, read in background thread::
 
-        self._backend.data = data
+            value = settings.aget('testapp.debug').result()
+
+        App settings should be prefixed with app name and dot. In ``asyncio``
+        code wrap future with ``asyncio.wrap_future`` to await it.
+        """
+        if not self._configured:
+            self.autoconf()
+
+        return self._backend.submit(self._get_by_name, name)
+
+    def aget_many(self, names):
+        """
+        Return future with ``dict`` of settings values, read in one background
+        thread call from the same backend data snapshot.
+        """
+        if not self._configured:
+            self.autoconf()
+
+        def get_many():
+            data, _ = self._backend.snapshot()
+            return dict((name, self._resolve_by_name(data, name))
+                        for name in names)
+
+        return self._backend.submit(get_many)
+
+    def ais_valid(self, full=False):
+        """
+        Check whether current settings are valid in background thread and
+        return future with result.
+        """
+        assert self._configured, '``LazySettings`` should be configured ' \
+                                 'before validating.'
+        return self._backend.ais_valid(full=full)
+
+    def arevert(self):
+        """
+        Revert settings to default values in background thread and return
+        future.
+        """
+        assert self._configured, '``LazySettings`` should be configured ' \
+                                 'before reverting.'
+        return self._backend.arevert()
+
+    def asave(self, keys=None):
+        """
+        Save customized settings in background thread and return future.
+        """
+        assert self._configured, '``LazySettings`` should be configured ' \
+                                 'before saving.'
+        return self._backend.asave(keys=keys)
 
     def autoconf(self):
         """
@@ -127,7 +195,9 @@ class LazySettings(object):
         except ImportError:
             pass
         else:
-            return self.configure(framework='setman.frameworks.django_setman')
+            backend = getattr(settings, 'SETMAN_BACKEND', None)
+            return self.configure(backend=backend,
+                                  framework='setman.frameworks.django_setman')
 
         message = 'Not enough data to auto configure setman library. Please, '\
                   'call ``settings.configure`` manually.'
@@ -135,6 +205,23 @@ class LazySettings(object):
 
         raise ImproperlyConfigured(message)
 
+    def batch(self, save=False):
+        """
+        Context manager to set many settings values at once::
+
+            with settings.batch(save=True):
+                settings.max_processes = 4
+                settings.testapp.debug = True
+
+        All values are published to the backend only on exit from the block,
+        so until that readers see previous values. If ``save`` is ``True``,
+        settings would be saved right after.
+        """
+        if not self._configured:
+            self.autoconf()
+
+        return self._backend.batch(save)
+
     def configure(self, backend=None, framework=None, **kwargs):
         """
         Setup which backend will be used for reading and saving settings data
@@ -210,6 +297,12 @@ class LazySettings(object):
             backend_klass = framework_klass.default_backend
 
         self._framework = framework_klass(**kwargs)
+
+        if self._framework.stats:
+            stats.enable()
+        else:
+            stats.disable()
+
         self._settings = self._get_available_settings()
 
         backend_kwargs = kwargs.copy()
@@ -227,13 +320,16 @@ class LazySettings(object):
                                  'before validating.'
         return self._backend.error
 
-    def is_valid(self):
+    def is_valid(self, full=False):
         """
         Check whether current settings are valid or not.
+
+        By default only settings changed since last loading or saving are
+        validated, pass ``full=True`` to validate all settings.
         """
         assert self._configured, '``LazySettings`` should be configured ' \
                                  'before validating.'
-        return self._backend.is_valid()
+        return self._backend.is_valid(full=full)
 
     def revert(self):
         """
@@ -243,13 +339,51 @@ class LazySettings(object):
                                  'before reverting.'
         self._backend.revert()
 
-    def save(self):
+    def save(self, keys=None):
         """
         Save customized settings to the database.
+
+        Pass ``keys`` (iterable of ``(app_name, name)`` tuples, app name for
+        project settings is empty string) to save only these settings, if
+        backend supports partial saving.
+        """
+        assert self._configured, '``LazySettings`` should be configured ' \
+                                 'before saving.'
+
+        if keys is None or not self._backend.partial_save:
+            return self._backend.save()
+
+        self._backend.save(keys=keys)
+
+    def save_changes(self):
+        """
+        Save only settings changed since last loading or saving.
         """
         assert self._configured, '``LazySettings`` should be configured ' \
                                  'before saving.'
-        self._backend.save()
+        self._backend.save_changes()
+
+    def stats(self, reset=False):
+        """
+        Return ``dict`` with ``counters`` and ``timers`` recorded in current
+        process::
+
+            >>> settings.stats()
+            {'counters': {'lazy.lookup_misses': 4, ...},
+             'timers': {'backend.read': {'average': 0.0002, 'calls': 1,
+                                         'total': 0.0002}, ...}}
+
+        Counters: ``lazy.lookup_misses`` (setting values resolved from
+        backend data), ``filebased.checks`` and ``filebased.changes``
+        (settings file checks and found changes), ``django.cache_hits`` and
+        ``django.cache_misses`` (getting ``Settings`` instance from the Django
+        cache). Timers: ``backend.read``, ``backend.save`` and
+        ``parse_configs``.
+
+        Returns ``None`` if stats recording is disabled. If ``reset`` is
+        ``True``, all recorded values are dropped after.
+        """
+        return stats.get_stats(reset)
 
     @property
     def _configured(self):
@@ -258,6 +392,20 @@ class LazySettings(object):
         """
         return bool(self._backend) and bool(self._framework)
 
+    def _cacheable(self, data, name):
+        """
+        Return ``False`` if setting value is resolved from framework settings
+        and so shouldn't be stored to lookup cache.
+        """
+        prefix = self._prefix
+
+        if prefix and prefix in data and name in data[prefix]:
+            return True
+        elif name in data and not isinstance(data[name], dict):
+            return True
+
+        return not hasattr(self._framework.settings, name)
+
     def _get_available_settings(self):
         """
         Parse configuration definition files and read all available settings
@@ -274,3 +422,52 @@ class LazySettings(object):
             setattr(self, '_available_settings_cache', cache)
 
         return getattr(self, '_available_settings_cache')
+
+    def _get_by_name(self, name):
+        """
+        Return project setting value or app setting value by ``app.NAME``
+        name.
+        """
+        if '.' in name:
+            prefix, name = name.split('.', 1)
+            return getattr(getattr(self, prefix), name)
+        return getattr(self, name)
+
+    def _resolve(self, data, name):
+        """
+        Resolve setting value from backend data, framework settings or from
+        available settings default values.
+        """
+        prefix = self._prefix
+        framework_settings = self._framework.settings
+
+        # Read app setting from database
+        if prefix and prefix in data and name in data[prefix]:
+            return data[prefix][name]
+        # Read project setting from database
+        elif name in data and not isinstance(data[name], dict):
+            return data[name]
+        # Or from framework settings
+        elif hasattr(framework_settings, name):
+            return getattr(framework_settings, name)
+        # Or read default value from available settings
+        elif hasattr(self._settings, name):
+            mixed = getattr(self._settings, name)
+
+            if is_settings_container(mixed):
+                return LazySettings(mixed, name, self)
+
+            return mixed.default
+
+        # If cannot read setting - raise error
+        raise SettingDoesNotExist(name)
+
+    def _resolve_by_name(self, data, name):
+        """
+        Resolve project setting value or app setting value by ``app.NAME``
+        name from backend data.
+        """
+        if '.' in name:
+            prefix, name = name.split('.', 1)
+            return self._resolve(data, prefix)._resolve(data, name)
+        return self._resolve(data, name)
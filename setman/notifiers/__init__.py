@@ -0,0 +1,79 @@
+import os
+
+from setman.exceptions import ImproperlyConfigured
+from setman.utils import importlib, logger
+
+
+__all__ = ('SetmanNotifier', 'get_notifier_klass')
+
+
+class SetmanNotifier(object):
+    """
+    How processes let each other know that new settings data published.
+
+    ``notify`` broadcasts generation of published data to all other
+    processes, which listen for notifications in background thread started by
+    ``start``. On each notification ``callback`` is called with generation
+    (or ``None`` if it's unknown).
+    """
+    def __init__(self, callback, **kwargs):
+        self.__dict__.update(kwargs)
+        self.callback = callback
+        self.pid = None
+
+    @property
+    def alive(self):
+        """
+        Background thread doesn't survive ``fork``, so notifier started in
+        parent process isn't alive in child process.
+        """
+        return self.pid == os.getpid()
+
+    def notify(self, generation=None):
+        """
+        Let other processes know that data with ``generation`` published.
+        """
+        raise NotImplementedError
+
+    def start(self):
+        """
+        Start listening for notifications in background thread.
+        """
+        raise NotImplementedError
+
+    def stop(self):
+        """
+        Stop listening for notifications.
+        """
+        raise NotImplementedError
+
+
+def get_notifier_klass(path):
+    """
+    Import notifier module by the Python path and return its ``Notifier``
+    class.
+    """
+    try:
+        notifier_module = importlib.import_module(path)
+    except ImportError:
+        message = 'Cannot import notifier module from %r path' % path
+        logger.error(message)
+
+        raise ImproperlyConfigured(message)
+
+    try:
+        notifier_klass = getattr(notifier_module, 'Notifier')
+    except AttributeError:
+        message = 'Cannot import notifier class from %r module' % path
+        logger.error(message)
+
+        raise ImproperlyConfigured(message)
+
+    if not issubclass(notifier_klass, SetmanNotifier):
+        message = '%r is not a subclass of %r' % \
+                  (notifier_klass, SetmanNotifier)
+        logger.error(message)
+
+        raise ImproperlyConfigured(message)
+
+    return notifier_klass
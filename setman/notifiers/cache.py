@@ -0,0 +1,65 @@
+import os
+import threading
+
+from setman.backends.django.managers import get_generation
+from setman.notifiers import SetmanNotifier
+
+
+__all__ = ('Notifier', )
+
+
+DEFAULT_INTERVAL = 1.0
+
+
+class Notifier(SetmanNotifier):
+    """
+    Poll settings generation in the Django cache every ``interval`` seconds
+    in background thread. Use it when Unix domain sockets aren't available
+    or processes run on different hosts with shared Django cache.
+
+    Django backend increases generation in the cache on each save itself, so
+    ``notify`` does nothing. But unlike ``check_interval`` of Django backend,
+    reading settings doesn't touch the Django cache at all.
+
+    To enable, add next line to Django settings::
+
+        SETMAN_NOTIFIER = 'setman.notifiers.cache'
+
+    """
+    interval = None
+
+    def __init__(self, callback, **kwargs):
+        super(Notifier, self).__init__(callback, **kwargs)
+        self.interval = self.interval or DEFAULT_INTERVAL
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def notify(self, generation=None):
+        pass
+
+    def start(self):
+        self.pid = os.getpid()
+        self._stopped.clear()
+        self._generation = get_generation()
+
+        self._thread = threading.Thread(target=self.run,
+                                        name='setman-cache-notifier')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self.pid = None
+        self._stopped.set()
+
+    def run(self):
+        while not self._stopped.is_set():
+            self._stopped.wait(self.interval)
+
+            if self._stopped.is_set():
+                break
+
+            generation = get_generation()
+
+            if generation != self._generation:
+                self._generation = generation
+                self.callback(generation)
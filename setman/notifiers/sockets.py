@@ -0,0 +1,144 @@
+import errno
+import glob
+import os
+import socket
+import tempfile
+import threading
+import uuid
+
+from setman.exceptions import ImproperlyConfigured
+from setman.notifiers import SetmanNotifier
+from setman.utils import logger
+
+
+__all__ = ('Notifier', )
+
+
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), 'setman-notifier')
+RECEIVE_TIMEOUT = 0.5
+SOCKET_SUFFIX = '.sock'
+
+
+class Notifier(SetmanNotifier):
+    """
+    Send notifications over Unix domain datagram sockets.
+
+    Each listening process binds its own socket in ``path`` directory, so
+    all processes, which share settings, should use the same ``path``.
+    Notification is sent to all sockets in that directory, sockets left by
+    dead processes are removed by sender.
+
+    To enable, setup ``notifier`` option of backend::
+
+        settings.configure(backend='setman.backends.filebased',
+                           notifier='setman.notifiers.sockets',
+                           notifier_options={'path': '/var/run/myapp'},
+                           ...)
+
+    or ``SETMAN_NOTIFIER`` and ``SETMAN_NOTIFIER_OPTIONS`` Django settings.
+    """
+    path = None
+
+    def __init__(self, callback, **kwargs):
+        if not hasattr(socket, 'AF_UNIX'):
+            message = 'Unix domain sockets are not supported by the system.'
+            logger.error(message)
+
+            raise ImproperlyConfigured(message)
+
+        super(Notifier, self).__init__(callback, **kwargs)
+
+        self.filename = None
+        self.path = self.path or DEFAULT_PATH
+
+        self._socket = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def notify(self, generation=None):
+        message = '' if generation is None else str(generation)
+        pattern = os.path.join(self.path, '*' + SOCKET_SUFFIX)
+        sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+        # Never wait for receiver, which doesn't read its notifications, as
+        # notification is sent while holding backend write lock
+        sender.setblocking(False)
+
+        try:
+            for filename in glob.glob(pattern):
+                if filename == self.filename:
+                    continue
+
+                try:
+                    sender.sendto(message, filename)
+                except socket.error, e:
+                    # Nobody listens to socket anymore, remove it
+                    if e.errno in (errno.ECONNREFUSED, errno.ENOENT):
+                        self._remove(filename)
+                    # Receiver has enough unread notifications already, so drop
+                    # this one
+                    elif e.errno not in (errno.EAGAIN, errno.ENOBUFS):
+                        logger.error('Cannot send notification to %r socket',
+                                     filename)
+        finally:
+            sender.close()
+
+    def start(self):
+        try:
+            os.makedirs(self.path)
+        except OSError, e:
+            if e.errno != errno.EEXIST:
+                raise
+
+        self.pid = os.getpid()
+        self.filename = os.path.join(self.path, '%d-%s%s' % \
+                                     (self.pid, uuid.uuid4().hex[:8],
+                                      SOCKET_SUFFIX))
+
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(self.filename)
+        self._socket.settimeout(RECEIVE_TIMEOUT)
+        self._stopped.clear()
+
+        self._thread = threading.Thread(target=self.run,
+                                        args=(self._socket, ),
+                                        name='setman-sockets-notifier')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+        if self.alive and self.filename:
+            self._remove(self.filename)
+
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+        self.filename = self.pid = None
+
+    def run(self, sock):
+        while not self._stopped.is_set():
+            try:
+                message = sock.recv(64)
+            except socket.timeout:
+                continue
+            except socket.error:
+                break
+
+            if self._stopped.is_set():
+                break
+
+            try:
+                generation = int(message)
+            except ValueError:
+                generation = None
+
+            self.callback(generation)
+
+    def _remove(self, filename):
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
@@ -0,0 +1,136 @@
+"""
+Compact binary format for storing settings data, where each value could be
+read without parsing all other values.
+
+File starts with header, which contains magic string and length of index.
+Then JSON encoded index follows, which maps app names (empty string for
+project settings) to setting names and offsets and lengths of JSON encoded
+values. Values placed right after index.
+"""
+import json
+import struct
+
+from UserDict import DictMixin
+
+from setman.utils import SetmanJSONEncoder
+
+
+__all__ = ('LazyDict', 'dumps', 'loads')
+
+
+MAGIC = 'SETMAN\x00\x02'
+HEADER = struct.Struct('>%dsI' % len(MAGIC))
+
+
+class LazyDict(DictMixin):
+    """
+    Read-only ``dict``-like object, which decodes values from the buffer only
+    on first access to them.
+
+    Project settings values are decoded one by one, while app settings are
+    decoded all at once, when app name is accessed first time, and returned
+    as usual ``dict``.
+    """
+    def __init__(self, buffer, index, coerce=None, start=0):
+        self._buffer = buffer
+        self._cache = {}
+        self._coerce = coerce
+        self._index = index
+        self._start = start
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __getitem__(self, key):
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        item = self._index[key]
+
+        if isinstance(item, dict):
+            value = dict((name, self._decode(offset, length, name, key))
+                         for name, (offset, length) in item.iteritems())
+        else:
+            value = self._decode(item[0], item[1], key)
+
+        self._cache[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return repr(dict(self.iteritems()))
+
+    def __delitem__(self, key):
+        raise TypeError('%r object is read-only' % self.__class__.__name__)
+
+    __setitem__ = __delitem__
+
+    def keys(self):
+        return self._index.keys()
+
+    def _decode(self, offset, length, name, prefix=None):
+        offset += self._start
+        value = json.loads(self._buffer[offset:offset + length])
+
+        if self._coerce is not None:
+            value = self._coerce(name, value, prefix)
+
+        return value
+
+
+def dumps(data):
+    """
+    Convert settings data to binary string.
+    """
+    index, values, offset = {}, [], 0
+
+    for key, value in data.iteritems():
+        if isinstance(value, dict):
+            prefix, items = key, value.iteritems()
+        else:
+            prefix, items = '', ((key, value), )
+
+        app_index = index.setdefault(prefix, {})
+
+        for name, subvalue in items:
+            subvalue = json.dumps(subvalue, cls=SetmanJSONEncoder)
+            app_index[name] = (offset, len(subvalue))
+
+            values.append(subvalue)
+            offset += len(subvalue)
+
+    index = json.dumps(index, separators=(',', ':'))
+    return ''.join([HEADER.pack(MAGIC, len(index)), index] + values)
+
+
+def loads(buffer, coerce=None):
+    """
+    Read index from the buffer (string or ``mmap`` instance) and return
+    ``LazyDict`` instance.
+
+    If ``coerce`` function provided, it would be called for each decoded
+    value with value name, value itself and app name (or ``None``).
+    """
+    if not len(buffer):
+        return LazyDict(buffer, {}, coerce)
+
+    magic, length = HEADER.unpack_from(buffer, 0)
+
+    if magic != MAGIC:
+        raise ValueError('Buffer does not contain settings in binary format.')
+
+    start = HEADER.size + length
+    index = json.loads(buffer[HEADER.size:start])
+
+    # Move project settings to the top level of index
+    data = index.pop('', {})
+    data.update(index)
+
+    return LazyDict(buffer, data, coerce, start)
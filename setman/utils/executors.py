@@ -0,0 +1,126 @@
+import os
+import sys
+import threading
+
+from multiprocessing.pool import ThreadPool
+
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
+
+
+__all__ = ('Future', 'get_executor')
+
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class Future(object):
+    """
+    Result of function call in background thread. Supports subset of
+    ``concurrent.futures.Future`` API: ``done``, ``result``, ``exception`` and
+    ``add_done_callback`` methods.
+    """
+    def __init__(self):
+        self._callbacks = []
+        self._done = threading.Event()
+        self._exc_info = None
+        self._lock = threading.Lock()
+        self._result = None
+
+    def add_done_callback(self, callback):
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+
+        callback(self)
+
+    def done(self):
+        return self._done.is_set()
+
+    def exception(self, timeout=None):
+        self._wait(timeout)
+        return self._exc_info[1] if self._exc_info else None
+
+    def result(self, timeout=None):
+        self._wait(timeout)
+
+        if self._exc_info:
+            raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
+
+        return self._result
+
+    def set_exc_info(self, exc_info):
+        self._exc_info = exc_info
+        self._finish()
+
+    def set_result(self, result):
+        self._result = result
+        self._finish()
+
+    def _finish(self):
+        with self._lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            callback(self)
+
+    def _wait(self, timeout):
+        if not self._done.wait(timeout):
+            raise RuntimeError('Result is not ready yet.')
+
+
+class ThreadPoolExecutor(object):
+    """
+    Simple executor, which runs functions in ``multiprocessing`` thread pool.
+    Used only when ``concurrent.futures`` isn't available.
+    """
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self._pool = None
+
+    def submit(self, func, *args, **kwargs):
+        if self._pool is None:
+            self._pool = ThreadPool(self.max_workers)
+
+        future = Future()
+
+        def run():
+            try:
+                result = func(*args, **kwargs)
+            except:
+                future.set_exc_info(sys.exc_info())
+            else:
+                future.set_result(result)
+
+        self._pool.apply_async(run)
+        return future
+
+
+EXECUTOR = (None, None)
+
+
+def get_executor():
+    """
+    Return shared executor for running blocking settings calls in background
+    threads: ``concurrent.futures.ThreadPoolExecutor`` if it's available,
+    or simple thread pool executor otherwise.
+
+    Threads don't survive ``fork``, so each process gets its own executor.
+    """
+    global EXECUTOR
+
+    pid, executor = EXECUTOR
+
+    if executor is None or pid != os.getpid():
+        if futures is not None:
+            executor = futures.ThreadPoolExecutor(DEFAULT_MAX_WORKERS)
+        else:
+            executor = ThreadPoolExecutor(DEFAULT_MAX_WORKERS)
+
+        EXECUTOR = (os.getpid(), executor)
+
+    return executor
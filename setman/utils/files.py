@@ -0,0 +1,109 @@
+import errno
+import os
+import tempfile
+
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+__all__ = ('atomic_write', 'file_lock')
+
+
+def atomic_write(filename, content, mode='w+'):
+    """
+    Write content to the temporary file in the same directory, flush it to the
+    disk and then rename it to the ``filename``.
+
+    So other processes would read old or new file content, but never
+    partially written file.
+    """
+    dirname, basename = os.path.split(os.path.abspath(filename))
+    fd, temp_filename = tempfile.mkstemp(dir=dirname,
+                                         prefix='.%s.' % basename,
+                                         suffix='.tmp')
+
+    try:
+        handler = os.fdopen(fd, mode)
+
+        try:
+            handler.write(content)
+            handler.flush()
+            os.fsync(handler.fileno())
+        finally:
+            handler.close()
+
+        # Temporary files created only with owner permissions, so copy
+        # permissions from file to replace or use default ones
+        try:
+            file_mode = os.stat(filename).st_mode & 0777
+        except (IOError, OSError):
+            umask = os.umask(0)
+            os.umask(umask)
+            file_mode = 0666 & ~umask
+
+        os.chmod(temp_filename, file_mode)
+
+        try:
+            os.rename(temp_filename, filename)
+        except OSError:
+            # Windows doesn't allow to rename file to already existed one
+            if os.name != 'nt':
+                raise
+
+            os.remove(filename)
+            os.rename(temp_filename, filename)
+    except:
+        if os.path.isfile(temp_filename):
+            os.remove(temp_filename)
+        raise
+
+    fsync_dirname(dirname)
+
+
+@contextmanager
+def file_lock(filename):
+    """
+    Acquire exclusive advisory lock on ``filename`` (file would be created if
+    necessary). Other processes and threads, which try to acquire lock on the
+    same file, would wait until it released.
+
+    If ``fcntl`` module isn't available, no locks would be acquired at all.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    handler = open(filename, 'a')
+
+    try:
+        fcntl.flock(handler.fileno(), fcntl.LOCK_EX)
+
+        try:
+            yield
+        finally:
+            fcntl.flock(handler.fileno(), fcntl.LOCK_UN)
+    finally:
+        handler.close()
+
+
+def fsync_dirname(dirname):
+    """
+    Flush directory entry changes (like renaming file) to the disk, if it
+    supported by operating system.
+    """
+    try:
+        fd = os.open(dirname, os.O_RDONLY)
+    except (IOError, OSError):
+        return
+
+    try:
+        os.fsync(fd)
+    except (IOError, OSError), e:
+        if e.errno not in (errno.EBADF, errno.EINVAL):
+            raise
+    finally:
+        os.close(fd)
@@ -1,13 +1,21 @@
 import copy
+import hashlib
+import os
+import threading
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
 
 from setman.exceptions import SettingTypeDoesNotExist
-from setman.utils import ConfigParser, ConfigParserError, logger, \
-    types as setting_types
+from setman.utils import ConfigParser, ConfigParserError, logger, stats
+from setman.utils.files import atomic_write
 from setman.utils.ordereddict import OrderedDict
-from setman.utils.types import SetmanSetting
+from setman.utils.types import REGISTRY, get_setting_types
 
 
-__all__ = ('is_settings_container', )
+__all__ = ('is_settings_container', 'parse_configs', 'write_settings_cache')
 
 
 class SettingsContainer(object):
@@ -37,37 +45,85 @@ class SettingsContainer(object):
             setattr(self, name, value)
 
 
-def data_to_setting(data, additional_types=None):
+class LazySettingsContainer(SettingsContainer):
     """
-    Convert data dict to setting instance.
+    Local settings container, which parses app configuration definition file
+    only on first access to its settings or on first iteration.
     """
-    additional_types = list(additional_types or [])
-    setting = None
-    setting_type = data.get('type')
+    def __init__(self, path, app_name, additional_types=None,
+                 default_values=None):
+        super(LazySettingsContainer, self).__init__(path, app_name)
+        self._additional_types = additional_types
+        self._default_values = default_values
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if name.startswith('_') or self._loaded:
+            raise AttributeError(name)
+
+        self.load()
+        return getattr(self, name)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_lock', None)
+        return state
 
-    all_values = dir(setting_types) + additional_types
+    def __iter__(self):
+        self.load()
+        return super(LazySettingsContainer, self).__iter__()
 
-    for value in all_values:
-        if isinstance(value, basestring):
-            value = getattr(setting_types, value)
+    def __len__(self):
+        self.load()
+        return super(LazySettingsContainer, self).__len__()
 
-        try:
-            if not issubclass(value, SetmanSetting):
-                continue
-        except TypeError:
-            continue
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
 
-        if not value.type or not setting_type or \
-           value.type.lower() != setting_type.lower():
-            continue
+    def add(self, name, value):
+        self.load()
+        return super(LazySettingsContainer, self).add(name, value)
+
+    def load(self):
+        """
+        Parse app configuration definition file if it wasn't parsed yet.
+
+        Container marked as loaded only after all its settings added, so other
+        threads wait for parsing to finish instead of seeing empty container
+        and failed parsing would be retried on next access.
+        """
+        if self._loaded:
+            return
+
+        with self._lock:
+            if self._loaded:
+                return
+
+            settings = parse_config(self.path, self._additional_types,
+                                    self._default_values, self.app_name)
 
-        setting = value(**data)
+            for setting in settings:
+                super(LazySettingsContainer, self).add(setting.name, setting)
 
-    if setting is None:
+            self._loaded = True
+
+
+def data_to_setting(data, additional_types=None):
+    """
+    Convert data dict to setting instance.
+    """
+    setting_type = data.get('type')
+    setting_types = get_setting_types(additional_types)
+
+    try:
+        klass = setting_types[(setting_type or '').lower()]
+    except KeyError:
         raise SettingTypeDoesNotExist('%r setting type not found.' % \
                                       setting_type)
 
-    return setting
+    return klass(**data)
 
 
 def is_settings_container(value):
@@ -156,14 +212,40 @@ def parse_config(path, additional_types=None, default_values=None,
     return settings
 
 
-def parse_configs(framework):
+@stats.timed('parse_configs')
+def parse_configs(framework, use_cache=True):
     """
     Parse all available config definition files as for all availbale apps and
     for project itself at last.
 
     Also we need to read additional types and additional default values before
     parsing start.
+
+    If framework has ``settings_cache_file``, parsed settings would be stored
+    there and loaded from it on next call, until any of config definition
+    files or default values file changed.
     """
+    cache_file = framework.settings_cache_file
+
+    if cache_file and use_cache:
+        key = settings_cache_key(framework)
+
+        try:
+            handler = open(cache_file, 'rb')
+        except IOError:
+            pass
+        else:
+            try:
+                cached_key, all_settings = pickle.load(handler)
+            except Exception:
+                logger.exception('Cannot load parsed settings from %r',
+                                 cache_file)
+            else:
+                if cached_key == key:
+                    return all_settings
+            finally:
+                handler.close()
+
     additional_types = framework.get_additional_types()
     all_settings = SettingsContainer()
     default_values = {}
@@ -196,8 +278,9 @@ def parse_configs(framework):
         if app_name == '__project__':
             continue
 
-        settings = \
-            parse_config(path, additional_types, default_values, app_name)
+        # App settings would be parsed on first access to them
+        settings = LazySettingsContainer(path, app_name, additional_types,
+                                         default_values)
         all_settings.add(app_name, settings)
 
     # And finally read project configuration definition file if any
@@ -208,9 +291,74 @@ def parse_configs(framework):
     all_settings.add('__project__', settings)
     all_settings.path = settings.path
 
+    if cache_file:
+        write_settings_cache(framework, all_settings)
+
     return all_settings
 
 
+def settings_cache_key(framework):
+    """
+    Build key for parsed settings cache from ``setman`` version, registered
+    and additional types and path, modification time and content hash of
+    each config definition file and default values file.
+    """
+    from setman import get_version
+
+    pathes = framework.find_settings_files().items()
+    pathes.append(('__default_values__', framework.find_default_values_file()))
+
+    files = []
+
+    for name, path in sorted(pathes):
+        if not path:
+            continue
+
+        try:
+            handler = open(path, 'rb')
+        except IOError:
+            files.append((name, path, None, None))
+            continue
+
+        try:
+            mtime = os.fstat(handler.fileno()).st_mtime
+            content_hash = hashlib.md5(handler.read()).hexdigest()
+        finally:
+            handler.close()
+
+        files.append((name, path, mtime, content_hash))
+
+    # Types could be registered by ``register_type`` after cache was stored
+    registry = tuple(sorted((name, '%s.%s' % (klass.__module__,
+                                              klass.__name__))
+                            for name, klass in REGISTRY.iteritems()))
+
+    return (get_version(), registry, tuple(framework.additional_types or ()),
+            tuple(files))
+
+
+def write_settings_cache(framework, all_settings):
+    """
+    Store parsed settings to framework's ``settings_cache_file``.
+    """
+    cache_file = framework.settings_cache_file
+
+    # Parse all app settings before storing them to the cache
+    for settings in all_settings:
+        if isinstance(settings, LazySettingsContainer):
+            settings.load()
+
+    try:
+        content = pickle.dumps((settings_cache_key(framework), all_settings),
+                               pickle.HIGHEST_PROTOCOL)
+        atomic_write(cache_file, content, 'wb')
+    except Exception:
+        logger.exception('Cannot store parsed settings to %r', cache_file)
+        return False
+
+    return True
+
+
 def update_app_setting(setting, data):
     """
     Update app setting from the project configuration definition file.
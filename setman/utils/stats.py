@@ -0,0 +1,183 @@
+"""
+Process-wide counters and cumulative timers of ``setman`` internals.
+
+Recording is enabled by default and could be switched off by ``disable``
+function (or by ``stats=False`` framework option, ``SETMAN_STATS = False``
+for Django and Flask). Only slow paths are instrumented (resolving setting
+value from backend data, reading and saving data, parsing configuration
+definition files, checking files and cache), so reading cached setting
+values never touches stats lock. Counters increased on every setting read
+(like settings file checks of filebased backend) are recorded by ``fast_incr``
+without locking at all.
+"""
+import threading
+import time
+
+from contextlib import contextmanager
+from functools import wraps
+
+
+__all__ = ('Stats', 'disable', 'enable', 'fast_incr', 'get_stats', 'incr',
+           'timed', 'timer')
+
+
+class Stats(object):
+    """
+    Thread-safe storage of counters and cumulative timers.
+
+    Counters from ``fast_counters`` are increased without lock, so they could
+    miss some increments made by concurrent threads.
+    """
+    def __init__(self):
+        self.counters = {}
+        self.fast_counters = {}
+        self.lock = threading.Lock()
+        self.timers = {}
+
+    def add_time(self, name, seconds):
+        """
+        Add one call, which took ``seconds``, to the ``name`` timer.
+        """
+        with self.lock:
+            calls, total = self.timers.get(name, (0, 0.0))
+            self.timers[name] = (calls + 1, total + seconds)
+
+    def as_dict(self):
+        """
+        Return copy of all counters and timers as ``dict``. Each timer is
+        ``dict`` with number of calls, total and average time in seconds.
+        """
+        with self.lock:
+            counters = dict(self.counters)
+            timers = dict(self.timers)
+
+        counters.update(self.fast_counters)
+
+        return {
+            'counters': counters,
+            'timers': dict((name, {'average': total / calls,
+                                   'calls': calls,
+                                   'total': total})
+                           for name, (calls, total) in timers.iteritems()),
+        }
+
+    def incr(self, name, value=1):
+        """
+        Increase ``name`` counter.
+        """
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        """
+        Drop all counters and timers.
+        """
+        with self.lock:
+            self.counters = {}
+            self.fast_counters = {}
+            self.timers = {}
+
+
+STATS = Stats()
+
+
+def disable():
+    """
+    Stop recording stats and drop all recorded values.
+    """
+    global STATS
+    STATS = None
+
+
+def enable():
+    """
+    Start recording stats, if it isn't started yet.
+    """
+    global STATS
+
+    if STATS is None:
+        STATS = Stats()
+
+
+def fast_incr(name):
+    """
+    Increase ``name`` counter without locking, if recording is enabled. Use it
+    only on hot paths, where precise value isn't worth the lock.
+    """
+    stats = STATS
+
+    if stats is not None:
+        counters = stats.fast_counters
+        counters[name] = counters.get(name, 0) + 1
+
+
+def get_stats(reset=False):
+    """
+    Return all recorded counters and timers or ``None`` if recording is
+    disabled. If ``reset`` is ``True``, drop recorded values after.
+    """
+    stats = STATS
+
+    if stats is None:
+        return None
+
+    data = stats.as_dict()
+
+    if reset:
+        stats.reset()
+
+    return data
+
+
+def incr(name, value=1):
+    """
+    Increase ``name`` counter, if recording is enabled.
+    """
+    stats = STATS
+
+    if stats is not None:
+        stats.incr(name, value)
+
+
+def timed(name):
+    """
+    Decorator to record time of each function call to the ``name`` timer, if
+    recording is enabled.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            stats = STATS
+
+            if stats is None:
+                return func(*args, **kwargs)
+
+            started = time.time()
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.add_time(name, time.time() - started)
+
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def timer(name):
+    """
+    Record time of ``with`` block to the ``name`` timer, if recording is
+    enabled.
+    """
+    stats = STATS
+
+    if stats is None:
+        yield
+        return
+
+    started = time.time()
+
+    try:
+        yield
+    finally:
+        stats.add_time(name, time.time() - started)
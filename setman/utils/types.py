@@ -11,7 +11,14 @@ from setman.utils.validators import decimal_places_validator, \
 
 
 __all__ = ('SetmanSetting', 'BooleanSetting', 'ChoiceSetting',
-           'DecimalSetting', 'FloatSetting', 'IntSetting', 'StringSetting')
+           'DecimalSetting', 'FloatSetting', 'IntSetting', 'StringSetting',
+           'get_setting_types', 'register_type')
+
+
+# Registry of setting classes by lower-cased type names and cache of
+# registries extended by additional types
+REGISTRY = {}
+REGISTRY_CACHE = {}
 
 
 class SetmanSetting(object):
@@ -57,6 +64,14 @@ class SetmanSetting(object):
     def __repr__(self):
         return u'<%s: %s>' % (self.__class__.__name__, self.__unicode__())
 
+    def __getstate__(self):
+        """
+        Don't pickle lazy loaded validators and choices, they would be loaded
+        again after unpickling.
+        """
+        return dict((key, value) for key, value in self.__dict__.iteritems()
+                    if not key.endswith('_cache'))
+
     def __unicode__(self):
         return u'%s = %r' % (self.name, self.initial)
 
@@ -102,7 +117,14 @@ class SetmanSetting(object):
     def update(self, **kwargs):
         """
         Update attributes for current setting instance.
+
+        All lazy loaded and cached values (validators, choices) would be
+        reloaded after update.
         """
+        for key in self.__dict__.keys():
+            if key.endswith('_cache'):
+                delattr(self, key)
+
         self._validators = kwargs.pop('validators', None)
         restricted = ('field_klass', 'field_args', 'field_kwargs',
                       'validators')
@@ -139,24 +161,53 @@ class SetmanSetting(object):
 
             return value
 
-        for validator in self.validators:
-            value = validator(value)
+        return self.pipeline(value)
 
-        return value
+    @property
+    def loaded_validators(self):
+        """
+        Lazy loaded validators from configuration definition file.
+        """
+        cache_key = '_loaded_validators_cache'
+        if not hasattr(self, cache_key):
+            setattr(self, cache_key, self._parse_validators(self._validators))
+        return getattr(self, cache_key)
+
+    @property
+    def pipeline(self):
+        """
+        Function, which runs all setting validators one by one. Built once
+        and cached until next ``update`` call.
+        """
+        cache_key = '_pipeline_cache'
+
+        if not hasattr(self, cache_key):
+            validators = tuple(self.validators)
+
+            def pipeline(value):
+                for validator in validators:
+                    value = validator(value)
+                return value
+
+            setattr(self, cache_key, pipeline)
+
+        return getattr(self, cache_key)
 
     @property
     def validators(self):
         """
-        Lazy loaded validators.
+        List of builtin and loaded validators. Built once and cached until
+        next ``update`` call, so same validator functions used for validating
+        values in backend and in form fields.
         """
         cache_key = '_validators_cache'
-        if not hasattr(self, cache_key):
-            setattr(self, cache_key, self._parse_validators(self._validators))
 
-        builtin_validators = list(self.builtin_validators or [])
-        loaded_validators = getattr(self, cache_key)
+        if not hasattr(self, cache_key):
+            validators = list(self.builtin_validators or []) + \
+                         self.loaded_validators
+            setattr(self, cache_key, validators)
 
-        return builtin_validators + loaded_validators
+        return getattr(self, cache_key)
 
     def _parse_validators(self, value):
         """
@@ -423,3 +474,51 @@ class StringSetting(SetmanSetting):
         int_setting = IntSetting()
         self.max_length = int_setting.to_python(self.max_length)
         self.min_length = int_setting.to_python(self.min_length)
+
+
+def get_setting_types(additional_types=None):
+    """
+    Return ``dict`` of setting classes by lower-cased type names, where all
+    registered types are extended by ``additional_types``.
+
+    Result is cached for each ``additional_types`` tuple.
+    """
+    key = tuple(additional_types or ())
+
+    try:
+        return REGISTRY_CACHE[key]
+    except KeyError:
+        pass
+
+    registry = REGISTRY.copy()
+
+    for klass in key:
+        try:
+            if not issubclass(klass, SetmanSetting) or not klass.type:
+                continue
+        except TypeError:
+            continue
+
+        registry[klass.type.lower()] = klass
+
+    REGISTRY_CACHE[key] = registry
+    return registry
+
+
+def register_type(klass):
+    """
+    Register setting class, so it could be used as setting type in
+    configuration definition files. Could be used as class decorator.
+    """
+    if not issubclass(klass, SetmanSetting) or not klass.type:
+        raise TypeError('%r is not a setting class with type.' % klass)
+
+    REGISTRY[klass.type.lower()] = klass
+    REGISTRY_CACHE.clear()
+
+    return klass
+
+
+for klass in (BooleanSetting, ChoiceSetting, DecimalSetting, FloatSetting,
+              IntSetting, StringSetting):
+    register_type(klass)
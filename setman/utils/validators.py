@@ -70,9 +70,9 @@ def min_value_validator(min_value):
 
 
 def regex_validator(regex):
-    def validator(value):
-        compiled = re.compile(regex)
+    compiled = re.compile(regex)
 
+    def validator(value):
         if not compiled.match(value):
             raise error('Enter a valid value.')
 
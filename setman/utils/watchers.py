@@ -0,0 +1,151 @@
+import os
+import threading
+
+try:
+    import pyinotify
+except ImportError:
+    pyinotify = None
+
+from setman.utils import logger
+
+
+__all__ = ('InotifyWatcher', 'PollingWatcher', 'get_watcher_klass')
+
+
+DEFAULT_INTERVAL = 1.0
+
+
+class Watcher(object):
+    """
+    Base class for watchers, which call ``callback`` in background thread
+    each time when one of watched files changed.
+    """
+    def __init__(self, filenames, callback, interval=None):
+        self.callback = callback
+        self.filenames = filenames
+        self.interval = interval or DEFAULT_INTERVAL
+        self.pid = None
+
+    @property
+    def alive(self):
+        """
+        Background thread doesn't survive ``fork``, so watcher started in
+        parent process isn't alive in child process.
+        """
+        return self.pid == os.getpid()
+
+    def start(self):
+        raise NotImplementedError
+
+    def stop(self):
+        raise NotImplementedError
+
+
+class PollingWatcher(Watcher):
+    """
+    Check files modification time and size every ``interval`` seconds.
+    """
+    def __init__(self, *args, **kwargs):
+        super(PollingWatcher, self).__init__(*args, **kwargs)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.pid = os.getpid()
+        self._stopped.clear()
+        self._tokens = self.tokens()
+
+        self._thread = threading.Thread(target=self.run,
+                                        name='setman-polling-watcher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self.pid = None
+        self._stopped.set()
+
+    def run(self):
+        while not self._stopped.is_set():
+            self._stopped.wait(self.interval)
+
+            if self._stopped.is_set():
+                break
+
+            tokens = self.tokens()
+
+            if tokens != self._tokens:
+                self._tokens = tokens
+                self.callback()
+
+    def tokens(self):
+        tokens = []
+
+        for filename in self.filenames:
+            try:
+                stat = os.stat(filename)
+            except (IOError, OSError):
+                tokens.append(None)
+            else:
+                tokens.append((stat.st_mtime, stat.st_size, stat.st_ino))
+
+        return tokens
+
+
+class InotifyWatcher(Watcher):
+    """
+    Use ``inotify`` events to find out that files were changed. Needs
+    `pyinotify <http://pypi.python.org/pypi/pyinotify>`_ library installed.
+    """
+    def __init__(self, *args, **kwargs):
+        if pyinotify is None:
+            raise ImportError('Please, install pyinotify library first.')
+
+        super(InotifyWatcher, self).__init__(*args, **kwargs)
+        self._notifier = None
+
+    def start(self):
+        self.pid = os.getpid()
+
+        filenames = set(map(os.path.abspath, self.filenames))
+        callback = self.callback
+
+        class Handler(pyinotify.ProcessEvent):
+            def process_default(self, event):
+                if event.pathname in filenames:
+                    callback()
+
+        mask = pyinotify.IN_CLOSE_WRITE | pyinotify.IN_DELETE | \
+               pyinotify.IN_MOVED_TO
+        manager = pyinotify.WatchManager()
+
+        for dirname in set(map(os.path.dirname, filenames)):
+            manager.add_watch(dirname, mask)
+
+        self._notifier = pyinotify.ThreadedNotifier(manager, Handler())
+        self._notifier.daemon = True
+        self._notifier.start()
+
+    def stop(self):
+        self.pid = None
+
+        if self._notifier is not None:
+            self._notifier.stop()
+            self._notifier = None
+
+
+def get_watcher_klass(kind):
+    """
+    Return watcher class by its kind: ``'poll'``, ``'inotify'`` or ``True``
+    to use ``inotify`` when available and polling otherwise.
+    """
+    if kind == 'poll':
+        return PollingWatcher
+    elif kind == 'inotify':
+        return InotifyWatcher
+    elif kind is True:
+        return InotifyWatcher if pyinotify is not None else PollingWatcher
+
+    message = 'Unknown watcher kind %r' % kind
+    logger.error(message)
+
+    raise ValueError(message)
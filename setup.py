@@ -33,6 +33,7 @@ setup(
         'setman.frameworks.django_setman.management',
         'setman.frameworks.django_setman.migrations',
         'setman.frameworks.flask_setman',
+        'setman.notifiers',
         'setman.utils',
     ],
     classifiers=[
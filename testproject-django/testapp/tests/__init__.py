@@ -3,6 +3,7 @@ from django.conf import settings
 
 if not 'django_nose' in settings.INSTALLED_APPS or \
    not settings.TEST_RUNNER.startswith('django_nose.'):
+    from testapp.tests.test_backends import *
     from testapp.tests.test_commands import *
     from testapp.tests.test_forms import *
     from testapp.tests.test_helpers import *
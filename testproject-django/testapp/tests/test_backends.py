@@ -0,0 +1,120 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from setman import settings
+from setman.backends.django.models import SettingValue
+from setman.backends.django.rows import Backend
+
+
+__all__ = ('TestRowsBackend', )
+
+
+class TestRowsBackend(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def backend(self):
+        return Backend(available_settings=settings.available_settings,
+                       framework=settings._framework)
+
+    def test_read(self):
+        SettingValue.objects.create(name='INT_SETTING', value='42')
+        SettingValue.objects.create(app_name='testapp', name='app_setting',
+                                    value='"string"')
+
+        backend = self.backend()
+        self.assertEqual(backend.data['INT_SETTING'], 42)
+        self.assertEqual(backend.data['testapp'], {'app_setting': 'string'})
+
+    def test_save(self):
+        backend = self.backend()
+        backend.set_value('DECIMAL_SETTING', Decimal('8.5'))
+        backend.set_value('INT_SETTING', 42)
+        backend.set_value('app_setting', 'string', 'testapp')
+        backend.save()
+
+        self.assertEqual(SettingValue.objects.count(), 3)
+        self.assertEqual(self.backend().data['DECIMAL_SETTING'],
+                         Decimal('8.5'))
+
+        # Only changed values are written
+        backend.data
+        backend.set_value('INT_SETTING', 24)
+
+        with self.assertNumQueries(1):
+            backend.save()
+
+        self.assertEqual(SettingValue.objects.get(name='INT_SETTING').value,
+                         '24')
+
+        # Unchanged data doesn't touch database at all
+        backend.data
+
+        with self.assertNumQueries(0):
+            backend.save()
+
+    def test_save_concurrent(self):
+        first, second = self.backend(), self.backend()
+        first.data, second.data
+
+        first.set_value('INT_SETTING', 42)
+        second.set_value('FLOAT_SETTING', 4.2)
+        first.save()
+        second.save()
+
+        data = self.backend().data
+        self.assertEqual(data['INT_SETTING'], 42)
+        self.assertEqual(data['FLOAT_SETTING'], 4.2)
+
+    def test_save_inserted_concurrently(self):
+        backend = self.backend()
+        backend.set_value('INT_SETTING', 42)
+        original_insert = backend._insert
+
+        def concurrent_insert(insert):
+            # Emulate other process, which inserts same row right after update
+            if not SettingValue.objects.exists():
+                SettingValue.objects.create(name='INT_SETTING', value='24')
+            return original_insert(insert)
+
+        backend._insert = concurrent_insert
+        backend.save()
+
+        self.assertEqual(SettingValue.objects.get().value, '42')
+
+    def test_save_keys(self):
+        backend = self.backend()
+        backend.data
+        backend.set_value('INT_SETTING', 42)
+        backend.set_value('FLOAT_SETTING', 4.2)
+
+        with self.assertNumQueries(2):
+            backend.save(keys=[('', 'INT_SETTING')])
+
+        data = self.backend().data
+        self.assertEqual(data['INT_SETTING'], 42)
+        self.assertFalse('FLOAT_SETTING' in data)
+
+        # Value not saved yet stays
+        self.assertEqual(backend.data['FLOAT_SETTING'], 4.2)
+        self.assertEqual(backend.dirty_keys, set([('', 'FLOAT_SETTING')]))
+
+        with self.assertNumQueries(2):
+            backend.save_changes()
+
+        self.assertEqual(self.backend().data['FLOAT_SETTING'], 4.2)
+
+    def test_save_deleted(self):
+        backend = self.backend()
+        backend.set_value('INT_SETTING', 42)
+        backend.save()
+
+        data = dict(backend.data)
+        del data['INT_SETTING']
+        backend.data = data
+        backend.save()
+
+        self.assertEqual(SettingValue.objects.count(), 0)
@@ -1,7 +1,17 @@
+import os
+import tempfile
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from StringIO import StringIO
+
 from django.core.management import call_command
 from django.test import TestCase
 
+from setman import settings as setman_settings
 from setman.frameworks.django_setman.models import Settings
+from setman.utils.parsing import parse_configs
 
 from testapp.tests.test_models import TEST_SETTINGS
 from testapp.tests.test_ui import NEW_SETTINGS
@@ -45,3 +55,43 @@ class TestSetmanCmd(TestCase):
 
         settings = Settings.objects.get()
         self.check_settings(settings, TEST_SETTINGS)
+
+    def test_store_settings_cache(self):
+        framework = setman_settings._framework
+        handler, filename = tempfile.mkstemp(prefix='setman-', suffix='.cache')
+        os.close(handler)
+        os.remove(filename)
+
+        framework.settings_cache_file = filename
+
+        try:
+            call_command('setman_cmd', cache=True, verbosity=0)
+            self.assertTrue(os.path.isfile(filename))
+
+            all_settings = parse_configs(framework)
+            self.assertEqual(len(all_settings),
+                             len(setman_settings.available_settings))
+        finally:
+            framework.settings_cache_file = None
+
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+    def test_stats(self):
+        Settings.objects.create(data=NEW_SETTINGS)
+        setman_settings.stats(reset=True)
+
+        setman_settings._backend.clear()
+        setman_settings.INT_SETTING
+        setman_settings.INT_SETTING
+
+        data = setman_settings.stats()
+        self.assertEqual(data['counters']['lazy.lookup_misses'], 1)
+        self.assertEqual(data['timers']['backend.read']['calls'], 1)
+
+        output = StringIO()
+        call_command('setman_cmd', stats=True, stdout=output, verbosity=0)
+
+        output = output.getvalue()
+        self.assertIn('lazy.lookup_misses: 1', output)
+        self.assertIn('backend.read: 1 calls', output)
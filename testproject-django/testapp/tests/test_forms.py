@@ -127,6 +127,42 @@ class TestForms(TestCase):
                 result = SETTINGS_FIELDS[name]
             self.assertIsInstance(field, result)
 
+    def test_fields_cache(self):
+        framework = settings._framework
+        fields = framework.get_form_fields()
+        self.assertIs(framework.get_form_fields(), fields)
+
+        form = SettingsForm()
+        self.assertIsNot(form.fields['INT_SETTING'], fields['INT_SETTING'])
+        self.assertIsNot(form.fields['INT_SETTING'],
+                         self.form.fields['INT_SETTING'])
+
+        self.assertEqual(form.initial['INT_SETTING'], settings.INT_SETTING)
+        self.assertEqual(form.initial['testapp.app_setting'],
+                         settings.testapp.app_setting)
+
+    def test_initial_values_snapshot(self):
+        backend_klass = settings._backend.__class__
+        data = backend_klass.data
+        reads = []
+
+        self.assertFalse('data' in backend_klass.__dict__)
+
+        def read_data(backend):
+            reads.append(backend)
+            return data.fget(backend)
+
+        backend_klass.data = property(read_data, data.fset, data.fdel)
+
+        try:
+            form = SettingsForm()
+        finally:
+            del backend_klass.data
+
+        self.assertEqual(len(reads), 1)
+        self.assertEqual(form.initial['BOOLEAN_SETTING'],
+                         settings.BOOLEAN_SETTING)
+
     def test_regex(self):
         field = self.form.fields['STRING_SETTING']
         self.assertIsNone(field.max_length)
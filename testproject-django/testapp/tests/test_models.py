@@ -55,6 +55,20 @@ class TestSettingsModel(TestCase):
         settings = Settings.objects.get()
         self.assertTrue(settings.BOOLEAN_SETTING)
 
+    def test_cache_shared_data(self):
+        Settings.objects.create(data=TEST_SETTINGS)
+
+        first = Settings.objects.get()
+        second = Settings.objects.get()
+
+        self.assertTrue(first.data is second.data)
+        self.assertRaises(TypeError, first.data.update, {})
+
+        first.BOOLEAN_SETTING = True
+        self.assertTrue(first.BOOLEAN_SETTING)
+        self.assertFalse(second.BOOLEAN_SETTING)
+        self.assertFalse(Settings.objects.get().BOOLEAN_SETTING)
+
     def test_save(self):
         settings = Settings()
 
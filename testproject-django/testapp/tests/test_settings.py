@@ -1,9 +1,14 @@
+import time
+
 from django.conf import settings as django_settings
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, \
+    skipUnlessDBFeature
 
 from setman import settings
+from setman.backends.django.managers import CACHE_KEY, LEGACY_CACHE_KEY, \
+    incr_generation
 from setman.exceptions import SettingDoesNotExist
 from setman.frameworks.django_setman.models import Settings
 from setman.utils.parsing import is_settings_container
@@ -11,7 +16,7 @@ from setman.utils.parsing import is_settings_container
 from testapp.tests.test_models import TEST_SETTINGS
 
 
-__all__ = ('TestGlobalSettings', )
+__all__ = ('TestGlobalSettings', 'TestSavepoints')
 
 
 class TestGlobalSettings(TestCase):
@@ -90,6 +95,52 @@ class TestGlobalSettings(TestCase):
 
         check_values()
 
+    def test_generation(self):
+        backend = settings._backend
+        Settings.objects.create(data={})
+
+        self.assertFalse(settings.BOOLEAN_SETTING)
+        generation = backend.generation
+        self.assertEqual(backend.data_generation, generation)
+
+        settings.BOOLEAN_SETTING = True
+        settings.save()
+        self.assertEqual(backend.generation, generation + 1)
+
+        self.assertTrue(settings.BOOLEAN_SETTING)
+        self.assertEqual(backend.data_generation, generation + 1)
+
+        # Emulate save from another process, no signals sent here
+        Settings.objects.update(data={'BOOLEAN_SETTING': False})
+        cache.delete(CACHE_KEY)
+        incr_generation()
+
+        # Generation isn't checked by default
+        self.assertTrue(settings.BOOLEAN_SETTING)
+
+        backend.check_interval = 0
+
+        try:
+            self.assertFalse(settings.BOOLEAN_SETTING)
+            self.assertEqual(backend.data_generation, generation + 2)
+        finally:
+            backend.check_interval = None
+
+    def test_legacy_cache(self):
+        Settings.objects.create(data={'BOOLEAN_SETTING': True})
+
+        # Emulate ``Settings`` instance cached by previous version
+        cache.set(LEGACY_CACHE_KEY, {'BOOLEAN_SETTING': False})
+
+        self.assertTrue(settings.BOOLEAN_SETTING)
+        self.assertIsInstance(cache.get(CACHE_KEY), tuple)
+
+        settings.BOOLEAN_SETTING = False
+        settings.save()
+
+        self.assertIsNone(cache.get(LEGACY_CACHE_KEY))
+        self.assertFalse(Settings.objects.get().BOOLEAN_SETTING)
+
     def test_save_settings(self):
         instance = Settings.objects.create(data=TEST_SETTINGS)
 
@@ -106,7 +157,165 @@ class TestGlobalSettings(TestCase):
 
         self.assertFalse(instance.BOOLEAN_SETTING)
 
+    def test_check_interval(self):
+        backend = settings._backend
+        Settings.objects.create(data={})
+
+        backend.check_interval = 60
+        backend._checked_at = 0
+
+        try:
+            self.assertFalse(settings.BOOLEAN_SETTING)
+
+            # Emulate save from another process
+            Settings.objects.update(data={'BOOLEAN_SETTING': True})
+            cache.delete(CACHE_KEY)
+            incr_generation()
+
+            with self.assertNumQueries(0):
+                self.assertFalse(settings.BOOLEAN_SETTING)
+
+            backend._checked_at = 0
+            self.assertTrue(settings.BOOLEAN_SETTING)
+        finally:
+            backend.check_interval = None
+
+    def test_notifier(self):
+        backend = settings._backend
+        Settings.objects.create(data={})
+
+        backend.notifier = 'setman.notifiers.cache'
+        backend.notifier_options = {'interval': 0.01}
+
+        try:
+            self.assertFalse(settings.BOOLEAN_SETTING)
+
+            # Emulate save from another process
+            Settings.objects.update(data={'BOOLEAN_SETTING': True})
+            cache.delete(CACHE_KEY)
+            incr_generation()
+
+            for _ in range(100):
+                if backend._notified:
+                    break
+                time.sleep(0.01)
+
+            self.assertTrue(settings.BOOLEAN_SETTING)
+
+            with self.assertNumQueries(0):
+                self.assertTrue(settings.BOOLEAN_SETTING)
+        finally:
+            backend.stop_notifier()
+            backend.notifier = backend.notifier_options = None
+
+    def test_save_changes(self):
+        Settings.objects.create(data={})
+
+        settings.BOOLEAN_SETTING = True
+
+        # Emulate save from another process after data was read
+        Settings.objects.update(data={'INT_SETTING': 32})
+        cache.delete(CACHE_KEY)
+
+        settings.save_changes()
+
+        instance = Settings.objects.get()
+        self.assertTrue(instance.BOOLEAN_SETTING)
+        self.assertEqual(instance.INT_SETTING, 32)
+
+    def test_save_queries(self):
+        Settings.objects.create(data=TEST_SETTINGS)
+
+        self.assertFalse(settings.BOOLEAN_SETTING)
+        settings.BOOLEAN_SETTING = True
+
+        with self.assertNumQueries(1):
+            settings.save()
+
+        self.assertEqual(Settings.objects.count(), 1)
+        self.assertTrue(Settings.objects.get().BOOLEAN_SETTING)
+
+    def test_save_without_instance(self):
+        settings.BOOLEAN_SETTING = True
+        Settings.objects.all().delete()
+        settings.save()
+
+        self.assertEqual(Settings.objects.count(), 1)
+        self.assertTrue(Settings.objects.get().BOOLEAN_SETTING)
+
+    def test_save_without_instance_concurrent(self):
+        settings.BOOLEAN_SETTING = True
+        Settings.objects.all().delete()
+
+        backend = settings._backend
+        original_insert = backend._insert
+
+        def concurrent_insert(insert):
+            # Emulate other process, which creates instance right after update
+            if not Settings.objects.count():
+                Settings.objects.create(data={'INT_SETTING': 24}, pk=1)
+            return original_insert(insert)
+
+        backend._insert = concurrent_insert
+
+        try:
+            settings.save()
+        finally:
+            del backend._insert
+
+        self.assertEqual(Settings.objects.count(), 1)
+        self.assertTrue(Settings.objects.get().BOOLEAN_SETTING)
+
     def test_validation(self):
         settings.INT_SETTING = 12
         self.assertFalse(settings.is_valid())
         self.assertRaises(ValueError, settings.save)
+
+
+class TestSavepoints(TransactionTestCase):
+    """
+    Test creating ``Settings`` instance outside of managed transaction, on
+    database backends, which really use savepoints.
+    """
+    def setUp(self):
+        settings._backend.clear()
+        cache.clear()
+
+    def tearDown(self):
+        self.setUp()
+
+    @skipUnlessDBFeature('uses_savepoints')
+    def test_read_without_instance(self):
+        self.assertFalse(settings.BOOLEAN_SETTING)
+        self.assertEqual(Settings.objects.count(), 1)
+
+    @skipUnlessDBFeature('uses_savepoints')
+    def test_save_without_instance(self):
+        settings.BOOLEAN_SETTING = True
+        settings.save()
+
+        self.assertEqual(Settings.objects.count(), 1)
+        self.assertTrue(Settings.objects.get().BOOLEAN_SETTING)
+
+    @skipUnlessDBFeature('uses_savepoints')
+    def test_save_without_instance_concurrent(self):
+        settings.BOOLEAN_SETTING = True
+
+        backend = settings._backend
+        original_insert = backend._insert
+
+        def concurrent_insert(insert):
+            # Emulate other process, which creates instance right after update
+            if not Settings.objects.count():
+                Settings.objects.create(data={'INT_SETTING': 24}, pk=1)
+            return original_insert(insert)
+
+        backend._insert = concurrent_insert
+
+        try:
+            settings.save()
+        finally:
+            del backend._insert
+
+        self.assertEqual(Settings.objects.count(), 1)
+        self.assertTrue(Settings.objects.get().BOOLEAN_SETTING)
@@ -85,8 +85,9 @@ class TestCase(unittest.TestCase):
         settings._backend.filename = self.old_backend_filename
         settings._backend.clear()
 
-        if os.path.isfile(backend_filename):
-            os.unlink(backend_filename)
+        for suffix in ('', '.generation', '.lock'):
+            if os.path.isfile(backend_filename + suffix):
+                os.unlink(backend_filename + suffix)
 
     def url(self, *args, **kwargs):
         with app.test_request_context():
@@ -1,15 +1,198 @@
+import json
+import multiprocessing
 import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
 import unittest
 
 from decimal import Decimal
 
 from setman import settings
-from setman.exceptions import ValidationError
+from setman.exceptions import SettingDoesNotExist, SettingTypeDoesNotExist, \
+    ValidationError
+from setman.lazy import LazySettings
+from setman.notifiers import sockets
+from setman.utils import parsing, stats
+from setman.utils.binary import LazyDict
 from setman.utils.parsing import is_settings_container
+from setman.utils import types
 from setman.utils.types import BooleanSetting, DecimalSetting, IntSetting, \
-    StringSetting
+    StringSetting, register_type
 
-from testapp.app import configure_settings
+from testapp.app import SETTINGS_DATA_FILE, SETTINGS_FILE, SETTINGS_FILES, \
+    configure_settings
+
+
+class TestParsing(unittest.TestCase):
+
+    def setUp(self):
+        self.filename = SETTINGS_DATA_FILE % {'format': 'cache'}
+
+    def tearDown(self):
+        if os.path.isfile(self.filename):
+            os.remove(self.filename)
+
+    def configure(self, cache=True):
+        lazy_settings = LazySettings()
+        lazy_settings.configure(
+            backend='setman.backends.filebased',
+            filename=SETTINGS_DATA_FILE % {'format': 'json'},
+            settings_cache_file=self.filename if cache else None,
+            settings_file=SETTINGS_FILE,
+            settings_files=SETTINGS_FILES
+        )
+        return lazy_settings
+
+    def test_lazy_app_settings(self):
+        lazy_settings = self.configure(cache=False)
+        container = lazy_settings.available_settings.testapp
+
+        self.assertTrue(is_settings_container(container))
+        self.assertFalse(container._loaded)
+
+        self.assertEqual(lazy_settings.max_processes, 2)
+        self.assertFalse(container._loaded)
+
+        self.assertEqual(lazy_settings.testapp.debug, False)
+        self.assertTrue(container._loaded)
+        self.assertEqual(len(container), 1)
+
+    def test_lazy_app_settings_threads(self):
+        lazy_settings = self.configure(cache=False)
+        container = lazy_settings.available_settings.testapp
+        original_parse_config = parsing.parse_config
+
+        def parse_config(*args, **kwargs):
+            time.sleep(0.1)
+            return original_parse_config(*args, **kwargs)
+
+        def read():
+            try:
+                values.append(lazy_settings.testapp.debug)
+            except Exception, e:
+                values.append(e)
+
+        parsing.parse_config = parse_config
+        values = []
+
+        try:
+            threads = [threading.Thread(target=read) for _ in xrange(4)]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+        finally:
+            parsing.parse_config = original_parse_config
+
+        self.assertEqual(values, [False] * 4)
+        self.assertTrue(container._loaded)
+        self.assertEqual(len(container), 1)
+
+    def test_lazy_app_settings_failed_parse(self):
+        lazy_settings = self.configure(cache=False)
+        container = lazy_settings.available_settings.testapp
+        original_parse_config = parsing.parse_config
+
+        def parse_config(*args, **kwargs):
+            raise IOError('Cannot read configuration definition file')
+
+        parsing.parse_config = parse_config
+
+        try:
+            self.assertRaises(IOError, container.load)
+        finally:
+            parsing.parse_config = original_parse_config
+
+        self.assertFalse(container._loaded)
+        self.assertEqual(lazy_settings.testapp.debug, False)
+        self.assertTrue(container._loaded)
+
+    def test_register_type(self):
+        class ListSetting(StringSetting):
+            type = 'list'
+
+        data = {'name': 'hosts', 'type': 'List'}
+
+        self.assertRaises(SettingTypeDoesNotExist, parsing.data_to_setting,
+                          data)
+        self.assertIsInstance(parsing.data_to_setting(data, (ListSetting, )),
+                              ListSetting)
+
+        register_type(ListSetting)
+
+        try:
+            self.assertIsInstance(parsing.data_to_setting(data), ListSetting)
+        finally:
+            del types.REGISTRY['list']
+            types.REGISTRY_CACHE.clear()
+
+    def test_setting_pipeline(self):
+        setting = IntSetting(name='processes', min_value='1', max_value='16')
+
+        validators, pipeline = setting.validators, setting.pipeline
+        self.assertEqual(len(validators), 2)
+        self.assertIs(setting.validators, validators)
+        self.assertIs(setting.pipeline, pipeline)
+        self.assertEqual(pipeline(4), 4)
+
+        setting.update(max_value=None)
+        self.assertIsNot(setting.validators, validators)
+        self.assertIsNot(setting.pipeline, pipeline)
+        self.assertEqual(len(setting.validators), 1)
+
+    def test_settings_cache(self):
+        available_settings = self.configure().available_settings
+        self.assertTrue(os.path.isfile(self.filename))
+
+        def parse_config(*args, **kwargs):
+            self.fail('Config definition files should not be parsed.')
+
+        original_parse_config = parsing.parse_config
+        parsing.parse_config = parse_config
+
+        try:
+            cached_settings = self.configure().available_settings
+        finally:
+            parsing.parse_config = original_parse_config
+
+        self.assertEqual(len(cached_settings), len(available_settings))
+        self.assertEqual(cached_settings.max_processes.default, 2)
+        self.assertEqual(cached_settings.testapp.debug.default, False)
+        self.assertEqual(
+            cached_settings.max_processes.validators[0](4), 4
+        )
+
+        # Changed definition file invalidates cache
+        mtime = os.stat(SETTINGS_FILE).st_mtime
+        os.utime(SETTINGS_FILE, (mtime + 1, mtime + 1))
+
+        try:
+            parsing.parse_config = parse_config
+            self.assertRaises(AssertionError, self.configure)
+        finally:
+            parsing.parse_config = original_parse_config
+            os.utime(SETTINGS_FILE, (mtime, mtime))
+
+        # Registered type invalidates cache too
+        self.configure()
+
+        class ListSetting(StringSetting):
+            type = 'list'
+
+        register_type(ListSetting)
+
+        try:
+            parsing.parse_config = parse_config
+            self.assertRaises(AssertionError, self.configure)
+        finally:
+            parsing.parse_config = original_parse_config
+            del types.REGISTRY['list']
+            types.REGISTRY_CACHE.clear()
 
 
 class TestIni(unittest.TestCase):
@@ -21,11 +204,69 @@ class TestIni(unittest.TestCase):
         self.filename = settings._backend.filename
 
     def tearDown(self):
+        settings._backend.stop_notifier()
+        settings._backend.stop_watcher()
         settings._backend = None
         settings._framework = None
 
-        if os.path.isfile(self.filename):
-            os.remove(self.filename)
+        for suffix in ('', '.generation', '.journal', '.lock'):
+            if os.path.isfile(self.filename + suffix):
+                os.remove(self.filename + suffix)
+
+    def other_backend(self):
+        """
+        Emulate backend instance from another process.
+        """
+        backend = settings._backend
+        return backend.__class__(
+            available_settings=backend.available_settings,
+            filename=backend.filename,
+            format=backend.format,
+            framework=backend.framework,
+            journal=backend.journal
+        )
+
+    def test_async(self):
+        self.assertEqual(settings.aget('max_processes').result(5), 2)
+        self.assertFalse(settings.aget('testapp.debug').result(5))
+
+        settings.max_processes = 4
+        settings.testapp.debug = True
+
+        self.assertTrue(settings.ais_valid().result(5))
+        settings.asave().result(5)
+        self.assertEqual(self.other_backend().data['max_processes'], 4)
+
+        future = settings.aget_many(('max_processes', 'testapp.debug'))
+        self.assertEqual(future.result(5), {'max_processes': 4,
+                                            'testapp.debug': True})
+
+        # All values are read from one data snapshot
+        backend, snapshots = settings._backend, []
+        original_snapshot = backend.snapshot
+
+        def snapshot():
+            snapshots.append(True)
+            return original_snapshot()
+
+        backend.snapshot = snapshot
+
+        try:
+            future = settings.aget_many(('hourly_rate', 'max_processes',
+                                         'testapp.debug'))
+            self.assertEqual(future.result(5), {'hourly_rate': Decimal(15),
+                                                'max_processes': 4,
+                                                'testapp.debug': True})
+        finally:
+            del backend.snapshot
+
+        self.assertEqual(snapshots, [True])
+
+        settings.arevert().result(5)
+        self.assertEqual(settings.max_processes, 2)
+
+        future = settings.aget('testapp.does_not_exist')
+        self.assertRaises(SettingDoesNotExist, future.result, 5)
 
     def test_available_settings(self):
         self.assertEqual(len(settings.available_settings), 4)
@@ -49,6 +290,111 @@ class TestIni(unittest.TestCase):
         self.assertEqual(setting.default, False)
         self.assertIsInstance(setting, BooleanSetting)
 
+    def test_batch(self):
+        data = settings._backend.data
+
+        with settings.batch(save=True):
+            settings.max_processes = '4'
+            settings.hosts_file = '/etc/hosts.new'
+            settings.testapp.debug = 'yes'
+
+            self.assertIs(settings._backend.data, data)
+            self.assertEqual(settings.max_processes, 2)
+            self.assertFalse(os.path.isfile(self.filename))
+
+        self.assertTrue(os.path.isfile(self.filename))
+        self.assertEqual(settings.max_processes, 4)
+        self.assertEqual(settings.hosts_file, '/etc/hosts.new')
+        self.assertTrue(settings.testapp.debug)
+
+        try:
+            with settings.batch(save=True):
+                settings.max_processes = 8
+                raise ValueError
+        except ValueError:
+            pass
+
+        self.assertEqual(settings.max_processes, 4)
+        self.assertEqual(settings._backend.dirty_keys, set())
+
+        with settings.batch():
+            settings.max_processes = 8
+            self.assertEqual(settings._backend.dirty_keys, set())
+
+        self.assertEqual(settings._backend.dirty_keys,
+                         set([('', 'max_processes')]))
+
+    def test_batch_nested(self):
+        with settings.batch():
+            settings.max_processes = 4
+
+            try:
+                with settings.batch(save=True):
+                    settings.hosts_file = '/etc/hosts.new'
+                    settings.testapp.debug = True
+                    raise ValueError
+            except ValueError:
+                pass
+
+            settings.hourly_rate = Decimal(10)
+
+        # Only values of nested block are discarded
+        self.assertEqual(settings.max_processes, 4)
+        self.assertEqual(settings.hourly_rate, Decimal(10))
+        self.assertEqual(settings.hosts_file, '/etc/hosts')
+        self.assertFalse(settings.testapp.debug)
+        self.assertEqual(settings._backend.dirty_keys,
+                         set([('', 'hourly_rate'), ('', 'max_processes')]))
+        self.assertFalse(os.path.isfile(self.filename))
+
+    def test_concurrent_writes(self):
+        settings.max_processes = 2
+        settings.save()
+
+        stop = multiprocessing.Event()
+        errors = multiprocessing.Value('i', 0)
+        reads = multiprocessing.Value('i', 0)
+
+        def write():
+            backend, value = self.other_backend(), 2
+
+            while not stop.is_set():
+                value = 4 if value == 2 else 2
+                backend.data = {'max_processes': value}
+                backend.save()
+
+        def read():
+            backend = self.other_backend()
+
+            while not stop.is_set():
+                try:
+                    data = backend.read()
+                except Exception:
+                    data = {}
+
+                if not data.get('max_processes') in (2, 4):
+                    with errors.get_lock():
+                        errors.value += 1
+
+                with reads.get_lock():
+                    reads.value += 1
+
+        processes = [multiprocessing.Process(target=target)
+                     for target in (write, write, read, read)]
+
+        for process in processes:
+            process.start()
+
+        time.sleep(0.5)
+        stop.set()
+
+        for process in processes:
+            process.join()
+
+        self.assertEqual(errors.value, 0)
+        self.assertTrue(reads.value > 0)
+        self.assertIn(settings.max_processes, (2, 4))
+
     def test_convert_value(self):
         settings.max_processes = '16'
         settings.save()
@@ -64,6 +410,248 @@ class TestIni(unittest.TestCase):
         self.assertEqual(settings.hourly_rate, Decimal(15))
         self.assertFalse(settings.testapp.debug)
 
+    def test_dirty_keys(self):
+        backend = self.other_backend()
+        backend.data = {'max_processes': 24}
+        backend.save()
+
+        settings._backend.clear()
+        self.assertEqual(settings.max_processes, 24)
+        self.assertEqual(settings._backend.dirty_keys, set())
+
+        self.assertTrue(settings.is_valid())
+        self.assertFalse(settings.is_valid(full=True))
+
+        settings.hosts_file = '/etc/hosts.new'
+        settings.testapp.debug = True
+        self.assertEqual(settings._backend.dirty_keys,
+                         set([('', 'hosts_file'), ('testapp', 'debug')]))
+        self.assertTrue(settings.is_valid())
+
+        settings.max_processes = 32
+        self.assertFalse(settings.is_valid())
+
+        settings.max_processes = 4
+        self.assertTrue(settings.is_valid())
+
+        settings.save()
+        self.assertEqual(settings._backend.dirty_keys, set())
+
+    def test_generation(self):
+        backend = settings._backend
+        self.assertIsNone(backend.generation)
+
+        settings.max_processes = 2
+        settings.save()
+        self.assertEqual(backend.generation, 1)
+        self.assertEqual(settings.max_processes, 2)
+        self.assertEqual(backend.data_generation, 1)
+
+        # Another process reads same settings file
+        other = self.other_backend()
+        self.assertEqual(other.data, {'max_processes': 2})
+        self.assertFalse(other.ignore_cache)
+
+        settings.max_processes = 4
+        settings.save()
+        self.assertEqual(backend.generation, 2)
+
+        self.assertEqual(other.data, {'max_processes': 4})
+        self.assertEqual(other.data_generation, 2)
+
+    def test_initial_values(self):
+        settings.max_processes = 4
+        settings.testapp.debug = True
+
+        initial = settings._framework.get_initial_values()
+        self.assertEqual(initial, {'hosts_file': '/etc/hosts',
+                                   'hourly_rate': Decimal(15),
+                                   'max_processes': 4,
+                                   'testapp.debug': True})
+
+    def test_lookup_cache(self):
+        self.assertEqual(settings.max_processes, 2)
+        self.assertFalse(settings.testapp.debug)
+
+        cache = settings._backend.lookup_cache
+        self.assertEqual(cache[(None, 'max_processes')], 2)
+        self.assertFalse(cache[('testapp', 'debug')])
+
+        settings.testapp.debug = True
+        self.assertEqual(settings._backend.lookup_cache, {})
+        self.assertTrue(settings.testapp.debug)
+
+        settings.save()
+        self.assertEqual(settings._backend.lookup_cache, {})
+        self.assertTrue(settings.testapp.debug)
+
+        # Framework settings changed directly are never stale
+        framework_settings = settings._framework.settings
+        framework_settings.hosts_file = '/etc/hosts.framework'
+
+        try:
+            self.assertEqual(settings.hosts_file, '/etc/hosts.framework')
+            self.assertNotIn((None, 'hosts_file'),
+                             settings._backend.lookup_cache)
+
+            framework_settings.hosts_file = '/etc/hosts.override'
+            self.assertEqual(settings.hosts_file, '/etc/hosts.override')
+        finally:
+            del framework_settings.hosts_file
+
+        self.assertEqual(settings.hosts_file, '/etc/hosts')
+
+    def test_reload_dirty_keys(self):
+        settings.max_processes = 4
+
+        backend = self.other_backend()
+        backend.data = {'hosts_file': '/etc/hosts.new'}
+        backend.save()
+
+        # Data reloaded, but value not saved yet stays
+        self.assertEqual(settings.hosts_file, '/etc/hosts.new')
+        self.assertEqual(settings.max_processes, 4)
+        self.assertEqual(settings._backend.dirty_keys,
+                         set([('', 'max_processes')]))
+
+        settings.save_changes()
+
+        data = self.other_backend().data
+        self.assertEqual(data, {'hosts_file': '/etc/hosts.new',
+                                'max_processes': 4})
+
+    def test_save_changes(self):
+        settings.hosts_file = '/etc/hosts.new'
+        self.assertEqual(settings._backend.dirty_keys,
+                         set([('', 'hosts_file')]))
+
+        # Emulate save from another process after data was read
+        backend = self.other_backend()
+        backend.data = {'max_processes': 8, 'testapp': {'debug': True}}
+        backend.save()
+
+        settings.save_changes()
+        self.assertEqual(settings._backend.dirty_keys, set())
+
+        data = self.other_backend().data
+        self.assertEqual(data['hosts_file'], '/etc/hosts.new')
+        self.assertEqual(data['max_processes'], 8)
+        self.assertEqual(data['testapp']['debug'], True)
+
+        settings.testapp.debug = False
+        settings.max_processes = 4
+        settings.save(keys=[('testapp', 'debug')])
+
+        # Value not saved yet stays
+        self.assertEqual(settings.testapp.debug, False)
+        self.assertEqual(settings.max_processes, 4)
+        self.assertEqual(settings._backend.dirty_keys,
+                         set([('', 'max_processes')]))
+
+        data = self.other_backend().data
+        self.assertEqual(data['max_processes'], 8)
+        self.assertEqual(data['testapp']['debug'], False)
+
+    def test_notifier(self):
+        backend, other = settings._backend, self.other_backend()
+        path = tempfile.mkdtemp(prefix='setman-notifier-')
+
+        for instance in (backend, other):
+            instance.notifier = 'setman.notifiers.sockets'
+            instance.notifier_options = {'path': path}
+
+        counter = []
+        is_changed = backend.is_changed
+
+        def counted_is_changed():
+            counter.append(True)
+            return is_changed()
+
+        backend.is_changed = counted_is_changed
+
+        try:
+            self.assertEqual(settings.max_processes, 2)
+            self.assertEqual(settings.max_processes, 2)
+
+            other.data = {'max_processes': 4}
+            other.save()
+
+            for _ in range(100):
+                if settings.max_processes == 4:
+                    break
+                time.sleep(0.01)
+
+            self.assertEqual(settings.max_processes, 4)
+            self.assertEqual(counter, [])
+            self.assertEqual(len(os.listdir(path)), 2)
+        finally:
+            other.stop_notifier()
+            backend.stop_notifier()
+            shutil.rmtree(path)
+
+    def test_notifier_not_reading(self):
+        path = tempfile.mkdtemp(prefix='setman-notifier-')
+        filename = os.path.join(path, 'stopped' + sockets.SOCKET_SUFFIX)
+
+        receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        receiver.bind(filename)
+
+        notifier = sockets.Notifier(lambda generation: None, path=path)
+        thread = threading.Thread(target=lambda: [
+            notifier.notify(generation) for generation in xrange(1000)
+        ])
+        thread.daemon = True
+
+        try:
+            thread.start()
+            thread.join(5)
+
+            self.assertFalse(thread.is_alive())
+            self.assertTrue(os.path.exists(filename))
+        finally:
+            receiver.close()
+            shutil.rmtree(path)
+
+    def test_notifier_processes(self):
+        backend = settings._backend
+        path = tempfile.mkdtemp(prefix='setman-notifier-')
+
+        backend.notifier = 'setman.notifiers.sockets'
+        backend.notifier_options = {'path': path}
+
+        ready = multiprocessing.Event()
+        value = multiprocessing.Value('i', 0)
+
+        def read():
+            settings.max_processes
+            ready.set()
+
+            for _ in range(500):
+                if settings.max_processes == 4:
+                    break
+                time.sleep(0.01)
+
+            value.value = settings.max_processes
+
+        self.assertEqual(settings.max_processes, 2)
+        process = multiprocessing.Process(target=read)
+
+        try:
+            process.start()
+            self.assertTrue(ready.wait(5))
+
+            settings.max_processes = 4
+            settings.save()
+
+            process.join(10)
+            self.assertEqual(value.value, 4)
+        finally:
+            if process.is_alive():
+                process.terminate()
+
+            backend.stop_notifier()
+            shutil.rmtree(path)
+
     def test_restore(self):
         settings.max_processes = 4
         settings.hosts_file = '/etc/hosts.new'
@@ -77,6 +665,216 @@ class TestIni(unittest.TestCase):
         self.assertEqual(settings.hourly_rate, Decimal(15))
         self.assertFalse(settings.testapp.debug)
 
+        # Values of settings, which aren't available anymore, are dropped
+        other = self.other_backend()
+        other.data = dict(other.data, obsolete_setting='value')
+        other.save()
+
+        self.assertIn('obsolete_setting', settings._backend.data)
+        settings.revert()
+
+        self.assertNotIn('obsolete_setting', settings._backend.data)
+        self.assertNotIn('obsolete_setting', self.other_backend().data)
+
+    def test_snapshot(self):
+        data = settings._backend.data
+        self.assertEqual(settings.max_processes, 2)
+        self.assertIs(settings._backend.data, data)
+
+        settings.max_processes = 4
+        settings.testapp.debug = True
+        self.assertIsNot(settings._backend.data, data)
+        self.assertNotIn('max_processes', data)
+        self.assertNotIn('testapp', data)
+
+        data = settings._backend.data
+        self.assertEqual(data,
+                         {'max_processes': 4, 'testapp': {'debug': True}})
+
+        settings.testapp.debug = False
+        self.assertTrue(data['testapp']['debug'])
+        self.assertFalse(settings.testapp.debug)
+
+    def test_stats(self):
+        settings.stats(reset=True)
+
+        self.assertEqual(settings.max_processes, 2)
+        self.assertEqual(settings.max_processes, 2)
+
+        settings.max_processes = 4
+        settings.save()
+
+        self.assertEqual(settings.max_processes, 4)
+
+        data = settings.stats()
+        self.assertEqual(data['counters']['lazy.lookup_misses'], 2)
+        self.assertEqual(data['timers']['backend.read']['calls'], 2)
+        self.assertEqual(data['timers']['backend.save']['calls'], 1)
+        self.assertTrue(data['counters']['filebased.checks'])
+
+        calls = []
+
+        class CountedLock(object):
+            def __enter__(self):
+                calls.append(True)
+
+            def __exit__(self, *args):
+                pass
+
+        stats.STATS.lock = CountedLock()
+
+        try:
+            for _ in xrange(1000):
+                self.assertEqual(settings.max_processes, 4)
+        finally:
+            stats.STATS.lock = threading.Lock()
+
+        self.assertEqual(calls, [])
+        self.assertEqual(
+            settings.stats(reset=True)['counters']['filebased.checks'],
+            data['counters']['filebased.checks'] + 1000
+        )
+        self.assertNotIn('filebased.checks', settings.stats()['counters'])
+
+        other = self.other_backend()
+        other.data = {'max_processes': 8}
+        other.save()
+
+        settings.stats(reset=True)
+        self.assertEqual(settings.max_processes, 8)
+
+        data = settings.stats()
+        self.assertEqual(data['counters']['filebased.changes'], 1)
+        self.assertEqual(data['timers']['backend.read']['calls'], 1)
+
+        stats.disable()
+
+        try:
+            self.assertEqual(settings.max_processes, 8)
+            self.assertIsNone(settings.stats())
+        finally:
+            stats.enable()
+
+        self.assertEqual(settings.stats(), {'counters': {}, 'timers': {}})
+
+    def test_set_value_before_reload(self):
+        backend = settings._backend
+        self.assertEqual(settings.hosts_file, '/etc/hosts')
+
+        other = self.other_backend()
+        other.data = {'hosts_file': '/etc/other'}
+        other.save()
+
+        is_changed = backend.is_changed
+
+        def interleaved_is_changed():
+            changed = is_changed()
+
+            # Emulate other thread, which sets value after change was found,
+            # but before this thread takes the lock to reload data
+            if changed:
+                backend.is_changed = is_changed
+                backend.set_value('max_processes', 8)
+
+            return changed
+
+        backend.is_changed = interleaved_is_changed
+
+        try:
+            self.assertEqual(settings.hosts_file, '/etc/other')
+        finally:
+            if 'is_changed' in backend.__dict__:
+                del backend.is_changed
+
+        self.assertEqual(settings.max_processes, 8)
+
+    def test_threads(self):
+        backend, calls = settings._backend, []
+        original_read = backend.read
+
+        def read():
+            calls.append(1)
+            time.sleep(0.1)
+            return original_read()
+
+        backend.read = read
+        backend.clear()
+
+        values = []
+        threads = [threading.Thread(target=lambda: values.append(
+                                        settings.max_processes))
+                   for _ in xrange(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(values, [2] * 8)
+        self.assertEqual(len(calls), 1)
+
+        del backend.read
+
+        def write(name, prefix=None):
+            for i in xrange(100):
+                backend.set_value(name, i, prefix)
+
+        threads = [threading.Thread(target=write, args=('max_processes', )),
+                   threading.Thread(target=write, args=('hourly_rate', )),
+                   threading.Thread(target=write, args=('debug', 'testapp'))]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(settings.max_processes, 99)
+        self.assertEqual(settings.hourly_rate, Decimal(99))
+        self.assertTrue(settings.testapp.debug)
+
+    def test_check_interval(self):
+        other = self.other_backend()
+        settings._backend.check_interval = 60
+
+        self.assertEqual(settings.max_processes, 2)
+
+        other.data = {'max_processes': 4}
+        other.save()
+        self.assertEqual(settings.max_processes, 2)
+
+        del settings._backend._checked_at
+        self.assertEqual(settings.max_processes, 4)
+
+    def test_watch(self):
+        backend, other = settings._backend, self.other_backend()
+        backend.watch, backend.watch_interval = 'poll', 0.01
+
+        counter = []
+        is_changed = backend.is_changed
+
+        def counted_is_changed():
+            counter.append(True)
+            return is_changed()
+
+        backend.is_changed = counted_is_changed
+
+        self.assertEqual(settings.max_processes, 2)
+        self.assertEqual(settings.max_processes, 2)
+        self.assertEqual(len(counter), 1)
+
+        other.data = {'max_processes': 4}
+        other.save()
+
+        for _ in range(100):
+            if settings.max_processes == 4:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(settings.max_processes, 4)
+        self.assertEqual(len(counter), 1)
+
     def test_validators(self):
         settings.max_processes = 24
         self.assertFalse(settings.is_valid())
@@ -147,5 +945,132 @@ class TestPickle(TestIni):
     format = 'pickle'
 
 
+class TestBinary(TestIni):
+
+    format = 'binary'
+
+    def test_lazy_decoding(self):
+        settings.max_processes = 4
+        settings.hosts_file = '/etc/hosts.new'
+        settings.testapp.debug = True
+        settings.save()
+
+        data = settings._backend.data
+        self.assertIsInstance(data, LazyDict)
+        self.assertEqual(data._cache, {})
+
+        self.assertEqual(settings.max_processes, 4)
+        self.assertEqual(data._cache, {'max_processes': 4})
+
+        self.assertTrue(settings.testapp.debug)
+        self.assertEqual(sorted(data._cache.keys()),
+                         ['max_processes', 'testapp'])
+
+        self.assertEqual(settings.hosts_file, '/etc/hosts.new')
+        self.assertEqual(settings.hourly_rate, Decimal(15))
+        self.assertEqual(dict(data), {'hosts_file': '/etc/hosts.new',
+                                      'max_processes': 4,
+                                      'testapp': {'debug': True}})
+        self.assertRaises(TypeError, data.__setitem__, 'max_processes', 8)
+
+
+class TestJournal(TestJson):
+
+    def setUp(self):
+        super(TestJournal, self).setUp()
+        settings._backend.journal = True
+
+    def read_journal(self):
+        handler = open(self.filename + '.journal', 'r')
+        content = handler.read()
+        handler.close()
+        return content.splitlines()
+
+    def test_journal(self):
+        backend = settings._backend
+        backend.journal_max_records = 3
+
+        settings.max_processes = 4
+        settings.save()
+        self.assertEqual(self.read_journal(), [])
+
+        settings.hosts_file = '/etc/hosts.new'
+        settings.save()
+        self.assertEqual(len(self.read_journal()), 1)
+        self.assertEqual(json.loads(self.read_journal()[0]),
+                         {'set': {'': {'hosts_file': '/etc/hosts.new'}}})
+
+        settings.testapp.debug = True
+        del settings.max_processes
+        settings.save()
+        self.assertEqual(json.loads(self.read_journal()[1]),
+                         {'set': {'testapp': {'debug': True}},
+                          'delete': {'': ['max_processes']}})
+
+        other = self.other_backend()
+        self.assertEqual(other.data, {'hosts_file': '/etc/hosts.new',
+                                      'testapp': {'debug': True}})
+        self.assertEqual(settings.max_processes, 2)
+
+        # Changes from other processes to different keys are not lost
+        other.data = dict(other.data, hourly_rate=Decimal(10))
+        settings.max_processes = 8
+        other.save()
+        settings.save()
+        self.assertEqual(len(self.read_journal()), 0)
+
+        handler = open(self.filename, 'r')
+        self.assertEqual(json.loads(handler.read()),
+                         {'hosts_file': '/etc/hosts.new',
+                          'hourly_rate': '10',
+                          'max_processes': 8,
+                          'testapp': {'debug': True}})
+        handler.close()
+
+        self.assertEqual(settings.hourly_rate, Decimal(10))
+        self.assertEqual(settings.max_processes, 8)
+
+        # Broken last record is ignored
+        handler = open(self.filename + '.journal', 'a')
+        handler.write('{"set": {"": {"max_processes": 1')
+        handler.close()
+
+        self.assertEqual(other.read()['max_processes'], 8)
+
+        # Record saved after broken one isn't lost
+        settings.max_processes = 6
+        settings.save()
+
+        self.assertEqual(self.other_backend().data['max_processes'], 6)
+
+    def test_journal_records(self):
+        backend, other = settings._backend, self.other_backend()
+        backend.journal_max_records = other.journal_max_records = 4
+
+        settings.max_processes = 4
+        settings.save()
+        self.assertEqual(self.read_journal(), [])
+
+        # Records appended by other process are counted too
+        other.set_value('hourly_rate', Decimal(10))
+        other.save()
+        other.set_value('hourly_rate', Decimal(11))
+        other.save()
+
+        settings.hosts_file = '/etc/hosts.new'
+        settings.save()
+        self.assertEqual(len(self.read_journal()), 3)
+        self.assertEqual(backend._journal_position[2], 3)
+
+        settings.testapp.debug = True
+        settings.save()
+        self.assertEqual(self.read_journal(), [])
+
+        data = self.other_backend().data
+        self.assertEqual(data['hosts_file'], '/etc/hosts.new')
+        self.assertEqual(data['hourly_rate'], Decimal(11))
+        self.assertEqual(data['testapp'], {'debug': True})
+
+
 if __name__ == '__main__':
     unittest.main()